@@ -1,32 +1,177 @@
+import os
+from datetime import datetime, timedelta
+
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connection, models
+from django.db.models.functions import Substr
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from automation.models import Result
+from automation.models import Result, WorkflowJob
+from automation.playwright.utils.thumbnails import thumbnail_path
+
+COMMENT_PREVIEW_CHARS = 80
+# Below this many rows an exact COUNT(*) is cheap enough to keep.
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+def estimate_row_count(model):
+    """
+    Cheap row estimate for an unfiltered table, or None if unavailable.
+
+    PostgreSQL keeps one in pg_class; on SQLite MAX(id) is an index seek and
+    tracks the row count closely because results are upserted, not deleted.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table]
+            )
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] > 0 else None
+        if connection.vendor == "sqlite":
+            cursor.execute(f'SELECT MAX("id") FROM "{table}"')
+            row = cursor.fetchone()
+            return row[0] if row and row[0] else None
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Use the table estimate instead of COUNT(*) for large unfiltered lists."""
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is not None and not query.where:
+            estimate = estimate_row_count(self.object_list.model)
+            if estimate and estimate > ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class DateProbeQuerySet(models.QuerySet):
+    """
+    QuerySet whose datetimes() probes the index instead of scanning.
+
+    The admin date_hierarchy asks for the distinct years / months / days of
+    the filtered rows, which Django answers with a DISTINCT over a truncated
+    column — a full scan. Here the bounds come from MIN/MAX and every
+    candidate period is checked with an EXISTS range query, each of which is
+    a single seek on the created_at index.
+    """
+
+    def datetimes(self, field_name, kind, order="ASC", tzinfo=None):
+        if kind not in ("year", "month", "day"):
+            return super().datetimes(field_name, kind, order=order, tzinfo=tzinfo)
+
+        tz = tzinfo or timezone.get_current_timezone()
+        bounds = self.aggregate(
+            first=models.Min(field_name), last=models.Max(field_name)
+        )
+        if bounds["first"] is None:
+            return []
+        first = timezone.localtime(bounds["first"], tz)
+        last = timezone.localtime(bounds["last"], tz)
+
+        found = []
+        for start, end in self._periods(kind, first, last, tz):
+            lookup = {f"{field_name}__gte": start, f"{field_name}__lt": end}
+            if self.filter(**lookup).exists():
+                found.append(start)
+
+        return found if order == "ASC" else list(reversed(found))
+
+    @staticmethod
+    def _periods(kind, first, last, tz):
+        def aware(year, month=1, day=1):
+            return timezone.make_aware(datetime(year, month, day), tz)
+
+        if kind == "year":
+            for year in range(first.year, last.year + 1):
+                yield aware(year), aware(year + 1)
+        elif kind == "month":
+            year, month = first.year, first.month
+            while (year, month) <= (last.year, last.month):
+                if month == 12:
+                    next_year, next_month = year + 1, 1
+                else:
+                    next_year, next_month = year, month + 1
+                yield aware(year, month), aware(next_year, next_month)
+                year, month = next_year, next_month
+        else:
+            day = first.date()
+            while day <= last.date():
+                start = aware(day.year, day.month, day.day)
+                day += timedelta(days=1)
+                yield start, aware(day.year, day.month, day.day)
 
 
 @admin.register(Result)
 class ResultAdmin(admin.ModelAdmin):
     list_display = (
         "id",
+        "thumbnail",
         "test_case",
         "status_badge",
         "comment_preview",
+        "visual_diff",
         "created_at",
         "url",
     )
     list_filter = ("passed", "created_at")
-    search_fields = ("test_case", "comment")
-    readonly_fields = ("created_at", "updated_at")
+    # Substring match on the short test_case column only: step names embed
+    # the country, dates and guests, so a prefix match would miss them. No
+    # b-tree index serves a case-insensitive substring search, so this scans
+    # test_case; searching the much larger comment column is opt-in with a
+    # "comment:" prefix.
+    search_fields = ("test_case",)
+    search_help_text = (
+        "Matches anywhere in the test case name. "
+        'Prefix with "comment:" to search inside comments.'
+    )
+    date_hierarchy = "created_at"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    readonly_fields = ("screenshot_preview", "created_at", "updated_at")
     fieldsets = (
         (
             "Test Information",
             {"fields": ("test_case", "passed", "comment")},
         ),
+        (
+            "Screenshot",
+            {"fields": ("screenshot_preview", "screenshot")},
+        ),
+        (
+            "Visual Diff",
+            {
+                "fields": ("visual_diff_score", "visual_diff_heatmap"),
+                "classes": ("collapse",),
+            },
+        ),
         (
             "Timestamps",
             {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
         ),
     )
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        qs = DateProbeQuerySet(model=qs.model, query=qs.query, using=qs._db)
+        # Never pull the full comment for the list; SQL returns just a prefix.
+        return qs.defer("comment").annotate(
+            comment_head=Substr("comment", 1, COMMENT_PREVIEW_CHARS + 1)
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        if search_term.startswith("comment:"):
+            term = search_term[len("comment:") :].strip()
+            return queryset.filter(comment__icontains=term), False
+        return super().get_search_results(request, queryset, search_term)
+
     @admin.display(description="Status")
     def status_badge(self, obj):
         color, label = ("#2e7d32", "PASS") if obj.passed else ("#c62828", "FAIL")
@@ -37,8 +182,85 @@ class ResultAdmin(admin.ModelAdmin):
             label,
         )
 
+    @admin.display(description="Screenshot")
+    def thumbnail(self, obj):
+        if not obj.screenshot:
+            return "—"
+        thumb = thumbnail_path(obj.screenshot)
+        try:
+            version = int(os.path.getmtime(os.path.join(settings.MEDIA_ROOT, thumb)))
+        except OSError:
+            # Not rendered (yet, or Pillow missing): link the full image.
+            return format_html(
+                '<a href="{}{}" target="_blank">view</a>',
+                settings.MEDIA_URL,
+                obj.screenshot,
+            )
+        return format_html(
+            '<img src="{}{}?v={}" loading="lazy" decoding="async" width="120" '
+            'alt="" style="border:1px solid #ccc">',
+            settings.MEDIA_URL,
+            thumb,
+            version,
+        )
+
+    @admin.display(description="Preview")
+    def screenshot_preview(self, obj):
+        if not obj.screenshot:
+            return "—"
+        return format_html(
+            '<a href="{0}{1}" target="_blank"><img src="{0}{1}" loading="lazy" '
+            'alt="" style="max-width:100%;border:1px solid #ccc"></a>',
+            settings.MEDIA_URL,
+            obj.screenshot,
+        )
+
+    @admin.display(description="Visual diff", ordering="visual_diff_score")
+    def visual_diff(self, obj):
+        if obj.visual_diff_score is None:
+            return "—"
+        label = f"{obj.visual_diff_score:.2%}"
+        if obj.visual_diff_heatmap:
+            return format_html(
+                '<a href="{}{}" target="_blank">{}</a>',
+                settings.MEDIA_URL,
+                obj.visual_diff_heatmap,
+                label,
+            )
+        return label
+
     @admin.display(description="Comment")
     def comment_preview(self, obj):
-        if not obj.comment:
+        head = getattr(obj, "comment_head", None)
+        if not head:
             return "—"
-        return obj.comment[:80] + ("…" if len(obj.comment) > 80 else "")
+        if len(head) > COMMENT_PREVIEW_CHARS:
+            return head[:COMMENT_PREVIEW_CHARS] + "…"
+        return head
+
+
+@admin.register(WorkflowJob)
+class WorkflowJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "status",
+        "params",
+        "attempts",
+        "worker_id",
+        "heartbeat_at",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status",)
+    readonly_fields = (
+        "attempts",
+        "worker_id",
+        "run_id",
+        "lease_expires_at",
+        "heartbeat_at",
+        "result",
+        "error",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
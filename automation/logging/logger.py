@@ -1,29 +1,181 @@
+import atexit
+import contextlib
+import contextvars
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 
+# ----------------------------------------------------------------------
+# Configuration (environment overridable, read at import time)
+# ----------------------------------------------------------------------
 
-def get_logger(name):
-    os.makedirs("logs", exist_ok=True)
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+LOG_DIR = os.environ.get("AUTOMATION_LOG_DIR", "logs")
+LOG_FILE = os.environ.get("AUTOMATION_LOG_FILE", "automation.log")
+# "text" keeps the classic pipe-separated line, "json" writes JSON lines.
+LOG_FORMAT = os.environ.get("AUTOMATION_LOG_FORMAT", "text")
+LOG_MAX_BYTES = int(os.environ.get("AUTOMATION_LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get("AUTOMATION_LOG_BACKUP_COUNT", 5))
+# Messages longer than this are truncated before they are queued.
+LOG_MAX_MESSAGE_CHARS = int(
+    os.environ.get("AUTOMATION_LOG_MAX_MESSAGE_CHARS", 4000)
+)
+# Keep every Nth oversized message in full (0 = always truncate).
+LOG_OVERSIZE_SAMPLE_EVERY = int(
+    os.environ.get("AUTOMATION_LOG_OVERSIZE_SAMPLE_EVERY", 0)
+)
 
-    if not logger.handlers:
-        # Terminal output
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+run_id_var = contextvars.ContextVar("automation_run_id", default=None)
+step_id_var = contextvars.ContextVar("automation_step_id", default=None)
+
+_lock = threading.Lock()
+_queue = queue.SimpleQueue()
+_listener = None
+
+
+# ----------------------------------------------------------------------
+# Run / step context
+# ----------------------------------------------------------------------
+
+
+@contextlib.contextmanager
+def log_context(run_id=None, step_id=None):
+    """
+    Tag every record logged inside the block with run_id / step_id.
+
+    Uses contextvars, so concurrent workflows in separate threads or
+    asyncio tasks never see each other's ids.
+    """
+    tokens = []
+    if run_id is not None:
+        tokens.append((run_id_var, run_id_var.set(run_id)))
+    if step_id is not None:
+        tokens.append((step_id_var, step_id_var.set(step_id)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+# ----------------------------------------------------------------------
+# Handlers & formatters
+# ----------------------------------------------------------------------
+
+
+class TruncatingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Producer side: runs on the caller's thread, so it does as little as
+    possible — resolve the message, attach run/step ids, truncate oversized
+    payloads and enqueue. Tracebacks are formatted by the listener thread.
+    """
+
+    def __init__(
+        self,
+        log_queue,
+        max_chars=LOG_MAX_MESSAGE_CHARS,
+        sample_every=LOG_OVERSIZE_SAMPLE_EVERY,
+    ):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self.sample_every = sample_every
+        self._oversized = 0
+
+    def prepare(self, record):
+        message = record.getMessage()
+
+        if self.max_chars and len(message) > self.max_chars:
+            self._oversized += 1
+            sampled = self.sample_every and self._oversized % self.sample_every == 0
+            if not sampled:
+                message = (
+                    message[: self.max_chars]
+                    + f"… [truncated {len(message) - self.max_chars} chars]"
+                )
+
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = message
+        record.args = None
+        record.run_id = run_id_var.get()
+        record.step_id = step_id_var.get()
+        return record
 
-        # File output
-        file_handler = logging.FileHandler("logs/automation.log")
-        file_handler.setLevel(logging.INFO)
 
-        formatter = logging.Formatter(
-            "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-        )
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": getattr(record, "run_id", None),
+            "step_id": getattr(record, "step_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
 
-        console_handler.setFormatter(formatter)
-        file_handler.setFormatter(formatter)
 
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+def _build_formatter():
+    if LOG_FORMAT == "json":
+        return JsonLinesFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def _start_listener():
+    """Start the single listener thread that drains the shared queue."""
+    global _listener
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    formatter = _build_formatter()
+
+    # Terminal output
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+
+    # File output, rotated by size
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(LOG_DIR, LOG_FILE),
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+
+    _listener = logging.handlers.QueueListener(
+        _queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def stop_logging():
+    """Drain the queue and stop the listener thread. Safe to call twice."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def get_logger(name):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+
+    if _listener is None:
+        with _lock:
+            if _listener is None:
+                _start_listener()
+
+    if not logger.handlers:
+        logger.addHandler(TruncatingQueueHandler(_queue))
 
     return logger
@@ -0,0 +1,102 @@
+"""Browser-related command line options shared by the automation commands."""
+
+from automation.playwright.core.browser_manager import ResourceLimits
+from automation.playwright.core.context_template import ContextTemplate
+from automation.playwright.core.http_cache import HttpDiskCache
+from automation.playwright.core.launch_profile import PROFILES
+
+
+def add_browser_arguments(parser):
+    parser.add_argument(
+        "--context-template",
+        action="store_true",
+        help="Create contexts from a cached, pre-settled storage state",
+    )
+    parser.add_argument(
+        "--template-max-age",
+        type=int,
+        default=3600,
+        help="Rebuild the context template after this many seconds (default: 3600)",
+    )
+    parser.add_argument(
+        "--skip-clear",
+        action="store_true",
+        help="Skip the per-run cookie/storage wipe when the template is clean",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        default="default",
+        help="Launch profile; 'lean' is headless with tuned args, a small "
+        "viewport and animations disabled (default: default)",
+    )
+    parser.add_argument(
+        "--http-cache",
+        action="store_true",
+        help="Serve static assets from a disk cache shared across runs",
+    )
+    parser.add_argument(
+        "--http-cache-max-mb",
+        type=int,
+        default=512,
+        help="Evict least recently used cache entries above this size (default: 512)",
+    )
+
+
+def browser_options(options):
+    """Translate parsed options into BrowserManager / runner keyword args."""
+    template = None
+    if options["context_template"]:
+        template = ContextTemplate(max_age=options["template_max_age"])
+    http_cache = None
+    if options["http_cache"]:
+        http_cache = HttpDiskCache(max_bytes=options["http_cache_max_mb"] * 1024 * 1024)
+    return {
+        "context_template": template,
+        "skip_clear": options["skip_clear"],
+        "launch_profile": PROFILES[options["profile"]],
+        "http_cache": http_cache,
+    }
+
+
+def add_governor_arguments(parser):
+    """Resource governor thresholds for long-lived browsers (daemon, worker)."""
+    parser.add_argument(
+        "--reuse-context",
+        action="store_true",
+        help="Keep one browser context across runs until it is recycled",
+    )
+    parser.add_argument(
+        "--max-context-runs",
+        type=int,
+        default=None,
+        help="Recycle a reused context after this many runs",
+    )
+    parser.add_argument(
+        "--max-context-age",
+        type=int,
+        default=None,
+        help="Recycle a reused context after this many seconds",
+    )
+    parser.add_argument(
+        "--max-browser-runs",
+        type=int,
+        default=None,
+        help="Relaunch the browser after this many runs",
+    )
+    parser.add_argument(
+        "--max-browser-rss-mb",
+        type=int,
+        default=None,
+        help="Relaunch the browser once its processes exceed this RSS",
+    )
+
+
+def resource_limits(options):
+    return ResourceLimits(
+        reuse_context=options["reuse_context"],
+        max_context_runs=options["max_context_runs"],
+        max_context_age=options["max_context_age"],
+        max_browser_runs=options["max_browser_runs"],
+        max_browser_rss_mb=options["max_browser_rss_mb"],
+    )
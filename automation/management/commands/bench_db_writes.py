@@ -0,0 +1,121 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from automation.logging.logger import get_logger
+from automation.models import Result
+from automation.playwright.core.base_workflow import BaseWorkflow
+
+logger = get_logger("BenchDbWrites")
+
+BENCH_PREFIX = "[bench-db] "
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress the Result table with many concurrent _save_result writers and "
+        "report throughput, latency and 'database is locked' errors"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers", type=int, default=16, help="Concurrent writer threads"
+        )
+        parser.add_argument(
+            "--writes", type=int, default=200, help="Writes per writer"
+        )
+        parser.add_argument(
+            "--cases",
+            type=int,
+            default=30,
+            help="Distinct test cases per writer (upserts repeat after this)",
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the benchmark rows"
+        )
+
+    def _writer(self, index, options, start, stats, lock):
+        # No page, tracing, metrics or visual diff: only the DB write path.
+        workflow = BaseWorkflow(
+            None, collect_metrics=False, trace_buffer=0, visual_baseline=False
+        )
+        latencies, locked, failed = [], 0, 0
+        start.wait()
+        try:
+            for i in range(options["writes"]):
+                name = f"{BENCH_PREFIX}writer {index} case {i % options['cases']}"
+                began = time.perf_counter()
+                try:
+                    workflow._save_result(name, passed=i % 2 == 0, comment="x" * 200)
+                    latencies.append(time.perf_counter() - began)
+                except OperationalError as e:
+                    if "locked" in str(e):
+                        locked += 1
+                    else:
+                        failed += 1
+                except Exception:
+                    failed += 1
+        finally:
+            connections.close_all()
+
+        with lock:
+            stats["latencies"].extend(latencies)
+            stats["locked"] += locked
+            stats["failed"] += failed
+
+    def handle(self, *args, **options):
+        stats = {"latencies": [], "locked": 0, "failed": 0}
+        lock = threading.Lock()
+        start = threading.Event()
+        threads = [
+            threading.Thread(
+                target=self._writer, args=(i, options, start, stats, lock)
+            )
+            for i in range(options["writers"])
+        ]
+        for thread in threads:
+            thread.start()
+
+        started = time.perf_counter()
+        start.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(stats["latencies"])
+        ok = len(latencies)
+        attempted = options["writers"] * options["writes"]
+
+        def percentile(p):
+            return latencies[min(ok - 1, int(ok * p))] * 1000 if ok else 0.0
+
+        row = {
+            "vendor": connection.vendor,
+            "writers": options["writers"],
+            "attempted": attempted,
+            "ok": ok,
+            "locked": stats["locked"],
+            "failed": stats["failed"],
+            "writes_per_s": ok / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+        }
+        logger.info(f"DB write benchmark: {row}")
+
+        if not options["keep"]:
+            Result.objects.filter(test_case__startswith=BENCH_PREFIX).delete()
+
+        self.stdout.write(
+            f"{row['vendor']}: {row['writers']} writers, {row['ok']}/{attempted} "
+            f"writes in {elapsed:.2f}s ({row['writes_per_s']:.0f}/s)"
+        )
+        self.stdout.write(
+            f"latency p50 {row['p50_ms']:.1f} ms, p95 {row['p95_ms']:.1f} ms, "
+            f"p99 {row['p99_ms']:.1f} ms"
+        )
+        style = self.style.SUCCESS if not row["locked"] else self.style.ERROR
+        self.stdout.write(
+            style(f"locked errors: {row['locked']}, other errors: {row['failed']}")
+        )
@@ -0,0 +1,90 @@
+import json
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from automation.logging.logger import get_logger
+
+logger = get_logger("BenchExtraction")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure ResultPage.extract_properties latency, IPC payload size and "
+        "Python memory on synthetic results pages of growing size"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cards",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000, 10000],
+            help="Card counts to benchmark (default: 10 100 1000 10000)",
+        )
+        parser.add_argument(
+            "--images", type=int, default=5, help="Carousel images per card"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Extractions per card count"
+        )
+        parser.add_argument("--headed", action="store_true")
+
+    def handle(self, *args, **options):
+        from automation.playwright.core.browser_manager import BrowserManager
+        from automation.playwright.pages.result_page import ResultPage
+        from automation.playwright.utils.synthetic_results import (
+            SyntheticResultsServer,
+        )
+
+        rows = []
+
+        with SyntheticResultsServer() as server:
+            with BrowserManager(headless=not options["headed"]) as page:
+                result_page = ResultPage(page)
+
+                for cards in options["cards"]:
+                    url = server.url(cards=cards, images=options["images"])
+                    page.goto(url, wait_until="load", timeout=0)
+
+                    timings = []
+                    payload_bytes = 0
+                    peak_memory = 0
+
+                    for _ in range(options["repeat"]):
+                        tracemalloc.start()
+                        started = time.perf_counter()
+                        properties = result_page.extract_properties()
+                        timings.append(time.perf_counter() - started)
+                        _, peak = tracemalloc.get_traced_memory()
+                        tracemalloc.stop()
+
+                        peak_memory = max(peak_memory, peak)
+                        payload_bytes = len(json.dumps(properties).encode("utf-8"))
+
+                    if len(properties) != cards:
+                        logger.warning(
+                            f"Expected {cards} cards, extracted {len(properties)}"
+                        )
+
+                    row = {
+                        "cards": cards,
+                        "images": options["images"],
+                        "best_ms": min(timings) * 1000,
+                        "mean_ms": sum(timings) / len(timings) * 1000,
+                        "payload_kb": payload_bytes / 1024,
+                        "peak_mem_kb": peak_memory / 1024,
+                    }
+                    rows.append(row)
+                    logger.info(f"Extraction benchmark: {row}")
+
+        self.stdout.write(
+            f"{'cards':>8} {'images':>7} {'best ms':>10} {'mean ms':>10} "
+            f"{'payload KB':>12} {'peak mem KB':>12}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['cards']:>8} {row['images']:>7} {row['best_ms']:>10.1f} "
+                f"{row['mean_ms']:>10.1f} {row['payload_kb']:>12.1f} "
+                f"{row['peak_mem_kb']:>12.1f}"
+            )
@@ -0,0 +1,125 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from automation.logging.logger import get_logger
+from automation.models import Result
+from automation.playwright.core.http_cache import HttpDiskCache
+from automation.playwright.core.launch_profile import PROFILES
+
+logger = get_logger("BenchLaunchProfile")
+
+BENCH_PREFIX = "[bench-profile "
+
+
+class Command(BaseCommand):
+    help = (
+        "Run UserWorkflow under several launch profiles and compare browser "
+        "start-up and per-step latency side by side"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            nargs="+",
+            choices=sorted(PROFILES),
+            default=["default", "lean"],
+        )
+        parser.add_argument(
+            "--runs", type=int, default=3, help="Workflow runs per profile"
+        )
+        parser.add_argument(
+            "--country",
+            default="Japan",
+            help="Pin the search so every run takes the same steps",
+        )
+        parser.add_argument(
+            "--http-cache",
+            action="store_true",
+            help="Share a disk cache across runs (the first run warms it)",
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the benchmark Result rows"
+        )
+
+    def _run_profile(self, name, options, http_cache):
+        from automation.playwright.core.browser_manager import BrowserManager
+        from automation.playwright.workflow.user_workflow import UserWorkflow
+
+        prefix = f"{BENCH_PREFIX}{name}] "
+        launches, steps, statuses = [], {}, []
+        for _ in range(options["runs"]):
+            started = time.perf_counter()
+            manager = BrowserManager(
+                launch_profile=PROFILES[name], http_cache=http_cache
+            ).start()
+            try:
+                page = manager.new_page()
+                launches.append((time.perf_counter() - started) * 1000)
+
+                workflow = UserWorkflow(
+                    page, params={"country": options["country"]}, step_prefix=prefix
+                )
+                statuses.append(workflow.run()["status"])
+                for outcome in workflow.step_outcomes:
+                    if outcome["passed"]:
+                        step = outcome["test_case"][len(prefix) :]
+                        steps.setdefault(step, []).append(outcome["duration_ms"])
+                cache = manager.take_cache_stats()
+                if cache:
+                    self.stdout.write(
+                        f"{name} run: HTTP cache hit ratio {cache['hit_ratio']:.0%}, "
+                        f"{cache['bytes_saved'] / 1024 / 1024:.1f} MB saved"
+                    )
+            finally:
+                manager.stop()
+        return launches, steps, statuses
+
+    def handle(self, *args, **options):
+        profiles = list(dict.fromkeys(options["profiles"]))
+        http_cache = HttpDiskCache() if options["http_cache"] else None
+        runs = {
+            name: self._run_profile(name, options, http_cache) for name in profiles
+        }
+
+        if not options["keep"]:
+            Result.objects.filter(test_case__startswith=BENCH_PREFIX).delete()
+
+        header = f"{'step (median ms)':<60} " + " ".join(
+            f"{name:>10}" for name in profiles
+        )
+        self.stdout.write(header)
+
+        launch_cells = [
+            f"{statistics.median(runs[name][0]):>10.0f}" for name in profiles
+        ]
+        self.stdout.write(f"{'browser launch + context':<60} " + " ".join(launch_cells))
+
+        ordered_steps = list(
+            dict.fromkeys(step for name in profiles for step in runs[name][1])
+        )
+        totals = dict.fromkeys(profiles, 0.0)
+        for step in ordered_steps:
+            cells = []
+            for name in profiles:
+                durations = runs[name][1].get(step)
+                if not durations:
+                    cells.append(f"{'—':>10}")
+                    continue
+                median = statistics.median(durations)
+                totals[name] += median
+                cells.append(f"{median:>10.0f}")
+            self.stdout.write(f"{step[:60]:<60} " + " ".join(cells))
+
+        self.stdout.write(
+            f"{'sum of step medians':<60} "
+            + " ".join(f"{totals[name]:>10.0f}" for name in profiles)
+        )
+        for name in profiles:
+            statuses = runs[name][2]
+            passed = statuses.count("PASS")
+            logger.info(
+                f"Launch profile {name}: {passed}/{len(statuses)} passed, "
+                f"step medians {totals[name]:.0f} ms"
+            )
+            self.stdout.write(f"{name}: {passed}/{len(statuses)} runs passed")
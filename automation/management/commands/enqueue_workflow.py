@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from automation.service.jobs import JobError, enqueue_job
+
+
+class Command(BaseCommand):
+    help = "Queue UserWorkflow runs for run_worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--country")
+        parser.add_argument("--checkin", help="YYYY-MM-DD")
+        parser.add_argument("--checkout", help="YYYY-MM-DD")
+        parser.add_argument("--adults", type=int)
+        parser.add_argument("--children", type=int)
+        parser.add_argument("--infants", type=int)
+        parser.add_argument("--pets", type=int)
+        parser.add_argument("--listing-source", choices=("dom", "network"))
+        parser.add_argument(
+            "--count", type=int, default=1, help="Number of identical jobs"
+        )
+        parser.add_argument("--max-attempts", type=int, default=3)
+
+    def handle(self, *args, **kwargs):
+        params = {
+            key: kwargs[key]
+            for key in (
+                "country",
+                "checkin",
+                "checkout",
+                "adults",
+                "children",
+                "infants",
+                "pets",
+                "listing_source",
+            )
+        }
+        try:
+            jobs = [
+                enqueue_job(params, max_attempts=kwargs["max_attempts"])
+                for _ in range(kwargs["count"])
+            ]
+        except JobError as e:
+            raise CommandError(str(e))
+
+        ids = ", ".join(f"#{job.pk}" for job in jobs)
+        self.stdout.write(self.style.SUCCESS(f"Enqueued {len(jobs)} job(s): {ids}"))
@@ -0,0 +1,54 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from automation.logging.logger import get_logger
+from automation.service.export import (
+    EXPORT_FORMATS,
+    ExportError,
+    filter_results,
+    iter_export,
+)
+
+logger = get_logger("Command")
+
+
+class Command(BaseCommand):
+    help = "Stream Result rows to CSV or NDJSON with constant memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument(
+            "--output", "-o", help="Output file (default: stdout)", default="-"
+        )
+        parser.add_argument("--since", help="ISO date or datetime")
+        parser.add_argument("--until", help="ISO date or datetime (inclusive)")
+        parser.add_argument("--status", choices=("pass", "fail"))
+        parser.add_argument("--step", help="Substring of the test case name")
+
+    def handle(self, *args, **options):
+        try:
+            qs = filter_results(
+                since=options["since"],
+                until=options["until"],
+                status=options["status"],
+                step=options["step"],
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        output = options["output"]
+        stream = (
+            sys.stdout
+            if output == "-"
+            else open(output, "w", encoding="utf-8", newline="")
+        )
+        rows = 0
+        try:
+            for chunk in iter_export(qs, options["format"]):
+                stream.write(chunk)
+                rows += 1
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+        logger.info(f"Exported {rows} lines as {options['format']} to {output}")
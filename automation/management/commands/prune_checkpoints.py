@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from automation.logging.logger import get_logger
+from automation.models import WorkflowCheckpoint
+from automation.playwright.core.base_workflow import CHECKPOINT_MAX_AGE
+
+logger = get_logger("Command")
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete workflow checkpoints (and the cookie storage they hold) of runs "
+        "that were never resumed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=CHECKPOINT_MAX_AGE,
+            help="Delete checkpoints older than this many seconds "
+            f"(default: AUTOMATION_CHECKPOINT_MAX_AGE, {CHECKPOINT_MAX_AGE})",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options["max_age"])
+        deleted, _ = WorkflowCheckpoint.objects.filter(created_at__lt=cutoff).delete()
+        logger.info(f"Pruned {deleted} checkpoints older than {cutoff:%Y-%m-%d %H:%M}")
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} checkpoints"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from automation.logging.logger import get_logger
+from automation.service.rollups import rebuild_rollups
+
+logger = get_logger("Command")
+
+
+class Command(BaseCommand):
+    help = "Rebuild the hourly/daily step rollup tables from the StepRun history"
+
+    def handle(self, *args, **kwargs):
+        logger.info("Rebuilding rollups")
+        rows = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} rollup rows"))
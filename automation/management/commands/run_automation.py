@@ -1,6 +1,12 @@
-from django.core.management.base import BaseCommand
-from automation.service.workflow_runner import WorkFlowRunner
+from django.core.management.base import BaseCommand, CommandError
 from automation.logging.logger import get_logger
+from automation.playwright.core.browser_manager import ENGINES
+from automation.management.commands._browser_options import (
+    add_browser_arguments,
+    add_governor_arguments,
+    browser_options,
+    resource_limits,
+)
 
 logger = get_logger("Command")
 
@@ -8,17 +14,164 @@ logger = get_logger("Command")
 class Command(BaseCommand):
     help = "Run Playwright automation workflow"
 
+    def add_arguments(self, parser):
+        add_browser_arguments(parser)
+        add_governor_arguments(parser)
+        parser.add_argument(
+            "--resume",
+            metavar="KEY",
+            help="Resume a failed run from its last checkpoint (the key printed "
+            "when it failed)",
+        )
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep the process and browser warm and run on a schedule",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=300,
+            help="Seconds between scheduled runs in daemon mode (default: 300)",
+        )
+        parser.add_argument(
+            "--jitter",
+            type=float,
+            default=30,
+            help="Random ± seconds added to every interval (default: 30)",
+        )
+        parser.add_argument(
+            "--max-concurrent",
+            type=int,
+            default=1,
+            help="Maximum workflows running at once in daemon mode (default: 1)",
+        )
+        parser.add_argument(
+            "--max-runs",
+            type=int,
+            default=None,
+            help="Stop the daemon after this many runs",
+        )
+        parser.add_argument(
+            "--listing-source",
+            choices=("dom", "network"),
+            default="dom",
+            help="Read listings from the rendered cards or from the search "
+            "API responses (default: dom)",
+        )
+        parser.add_argument(
+            "--engines",
+            nargs="+",
+            choices=ENGINES,
+            help="Run the workflow on these engines in parallel and compare "
+            "step timings",
+        )
+
     def handle(self, *args, **kwargs):
+        if kwargs["daemon"]:
+            return self.handle_daemon(**kwargs)
+        if kwargs["engines"]:
+            return self.handle_engines(**kwargs)
+
+        from automation.service.workflow_runner import WorkFlowRunner
+
         logger.info("Command started")
         self.stdout.write(self.style.SUCCESS("Starting automation workflow..."))
 
         try:
             runner = WorkFlowRunner()
-            result = runner.run_user_workflow()
+            result = runner.run_user_workflow(
+                checkpoint_key=kwargs["resume"],
+                params={"listing_source": kwargs["listing_source"]},
+                **browser_options(kwargs),
+            )
             self.stdout.write(
                 self.style.SUCCESS(f"Workflow finished with status: {result['status']}")
             )
+            cache = result.get("http_cache")
+            if cache:
+                self.stdout.write(
+                    f"HTTP cache: {cache['hits']}/{cache['hits'] + cache['misses']} hits, "
+                    f"{cache['bytes_saved'] / 1024 / 1024:.1f} MB saved"
+                )
+            if result["status"] == "FAIL":
+                self.stdout.write(
+                    f"Retry from the last checkpoint with --resume {result['checkpoint_key']}"
+                )
             logger.info("Command completed")
         except Exception as e:
             logger.error(str(e))
             self.stdout.write(self.style.ERROR(f"Workflow failed: {str(e)}"))
+
+    def handle_engines(self, **kwargs):
+        from automation.service.workflow_runner import WorkFlowRunner
+
+        engines = list(dict.fromkeys(kwargs["engines"]))
+        logger.info(f"Engine matrix command started: {engines}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Running workflow on {', '.join(engines)}...")
+        )
+        results = WorkFlowRunner().run_engine_matrix(
+            engines,
+            params={"listing_source": kwargs["listing_source"]},
+            **browser_options(kwargs),
+        )
+
+        # Step timings side by side, in the order the steps first ran.
+        steps = {}
+        for engine in engines:
+            for name, passed, duration_ms in results[engine]["steps"]:
+                steps.setdefault(name, {})[engine] = (passed, duration_ms)
+
+        width = max([len(name) for name in steps] + [4])
+        width = min(width, 70)
+        self.stdout.write(
+            f"{'step':<{width}} " + " ".join(f"{e:>12}" for e in engines)
+        )
+        for name, by_engine in steps.items():
+            cells = []
+            for engine in engines:
+                if engine not in by_engine:
+                    cells.append(f"{'—':>12}")
+                    continue
+                passed, duration_ms = by_engine[engine]
+                cell = f"{duration_ms:.0f} ms" if passed else "FAIL"
+                cells.append(f"{cell:>12}")
+            self.stdout.write(f"{name[:width]:<{width}} " + " ".join(cells))
+
+        for engine in engines:
+            result = results[engine]
+            total = sum(d for _, _, d in result["steps"])
+            style = self.style.SUCCESS if result["status"] == "PASS" else self.style.ERROR
+            line = f"{engine}: {result['status']} in {total / 1000:.1f}s of steps"
+            if result.get("error"):
+                line += f" — {result['error']}"
+            self.stdout.write(style(line))
+
+    def handle_daemon(self, **kwargs):
+        from automation.service.daemon import AutomationDaemon
+
+        if kwargs["max_concurrent"] < 1:
+            raise CommandError(
+                f"--max-concurrent must be at least 1, got {kwargs['max_concurrent']}"
+            )
+        daemon = AutomationDaemon(
+            interval=kwargs["interval"],
+            jitter=kwargs["jitter"],
+            max_concurrent=kwargs["max_concurrent"],
+            max_runs=kwargs["max_runs"],
+            params={"listing_source": kwargs["listing_source"]},
+            resource_limits=resource_limits(kwargs),
+            **browser_options(kwargs),
+        )
+        daemon.install_signal_handlers()
+
+        logger.info("Daemon started")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Automation daemon running every {kwargs['interval']}s "
+                f"(±{kwargs['jitter']}s, max {kwargs['max_concurrent']} concurrent)"
+            )
+        )
+        results = daemon.serve_forever()
+        self.stdout.write(self.style.SUCCESS(f"Daemon stopped: {results}"))
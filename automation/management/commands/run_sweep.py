@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+from automation.logging.logger import get_logger
+
+logger = get_logger("Command")
+
+GUEST_KEYS = ("adults", "children", "infants", "pets")
+
+
+def parse_dates(value):
+    try:
+        checkin, checkout = value.split(":")
+    except ValueError:
+        raise CommandError(f"Dates must look like CHECKIN:CHECKOUT, got {value!r}")
+    return checkin, checkout
+
+
+def parse_guests(value):
+    try:
+        counts = [int(n) for n in value.split(",")]
+    except ValueError:
+        raise CommandError(
+            f"Guests must look like ADULTS[,CHILDREN,...], got {value!r}"
+        )
+    return dict(zip(GUEST_KEYS, counts))
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the workflow over a countries × dates × guests matrix, sharing "
+        "the landing page prefix and each country's search between scenarios"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--countries", nargs="+", required=True)
+        parser.add_argument(
+            "--dates",
+            nargs="+",
+            default=[],
+            help="CHECKIN:CHECKOUT pairs, e.g. 2026-12-01:2026-12-05",
+        )
+        parser.add_argument(
+            "--guests",
+            nargs="+",
+            default=[],
+            help="ADULTS[,CHILDREN[,INFANTS[,PETS]]] tuples, e.g. 2,1",
+        )
+
+    def handle(self, *args, **kwargs):
+        from automation.service.workflow_runner import WorkFlowRunner
+
+        dates = [parse_dates(v) for v in kwargs["dates"]]
+        guests = [parse_guests(v) for v in kwargs["guests"]]
+
+        logger.info("Sweep command started")
+        results = WorkFlowRunner().run_scenario_sweep(
+            kwargs["countries"], dates=dates, guests=guests
+        )
+
+        for result in results:
+            passed = result["status"] == "PASS"
+            style = self.style.SUCCESS if passed else self.style.ERROR
+            line = f"{result['status']:<9} {result['scenario']}"
+            if result["error"]:
+                line += f" — {result['error']}"
+            self.stdout.write(style(line))
+
+        passed = sum(1 for r in results if r["status"] == "PASS")
+        self.stdout.write(f"{passed}/{len(results)} scenarios passed")
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from automation.logging.logger import get_logger
+from automation.management.commands._browser_options import (
+    add_browser_arguments,
+    add_governor_arguments,
+    browser_options,
+    resource_limits,
+)
+from automation.service.jobs import DEFAULT_LEASE_SECONDS, JobWorker
+
+logger = get_logger("Command")
+
+
+class Command(BaseCommand):
+    help = "Claim and run queued WorkflowJobs (start several for more throughput)"
+
+    def add_arguments(self, parser):
+        add_browser_arguments(parser)
+        add_governor_arguments(parser)
+        parser.add_argument(
+            "--lease",
+            type=int,
+            default=DEFAULT_LEASE_SECONDS,
+            help=f"Job lease in seconds (default: {DEFAULT_LEASE_SECONDS})",
+        )
+        parser.add_argument(
+            "--poll",
+            type=float,
+            default=5,
+            help="Seconds to wait when the queue is empty (default: 5)",
+        )
+        parser.add_argument(
+            "--max-jobs", type=int, default=None, help="Exit after this many jobs"
+        )
+
+    def handle(self, *args, **kwargs):
+        worker = JobWorker(
+            lease_seconds=kwargs["lease"],
+            poll_interval=kwargs["poll"],
+            max_jobs=kwargs["max_jobs"],
+            resource_limits=resource_limits(kwargs),
+            **browser_options(kwargs),
+        )
+        worker.install_signal_handlers()
+
+        logger.info("Worker command started")
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker.worker_id} running"))
+        done = worker.serve_forever()
+        self.stdout.write(self.style.SUCCESS(f"Worker stopped after {done} jobs"))
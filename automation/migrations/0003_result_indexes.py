@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0002_result_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['-created_at'], name='result_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['passed', '-created_at'], name='result_passed_created_idx'),
+        ),
+    ]
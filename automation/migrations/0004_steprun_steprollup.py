@@ -0,0 +1,46 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0003_result_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StepRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(db_index=True, max_length=32)),
+                ('test_case', models.CharField(max_length=500)),
+                ('passed', models.BooleanField(default=False)),
+                ('duration_ms', models.FloatField(default=0)),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['test_case', 'created_at'], name='steprun_case_created_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StepRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('test_case', models.CharField(max_length=500)),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('period_start', models.DateTimeField()),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('duration_sum_ms', models.FloatField(default=0)),
+                ('duration_histogram', models.JSONField(default=list)),
+            ],
+            options={
+                'ordering': ['-period_start'],
+                'indexes': [models.Index(fields=['granularity', 'period_start'], name='steprollup_gran_period_idx')],
+                'constraints': [models.UniqueConstraint(fields=('test_case', 'granularity', 'period_start'), name='steprollup_unique_period')],
+            },
+        ),
+    ]
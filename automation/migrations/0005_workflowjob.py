@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0004_steprun_steprollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkflowJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('worker_id', models.CharField(blank=True, default='', max_length=200)),
+                ('run_id', models.CharField(blank=True, default='', max_length=32)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='workflowjob_status_idx'), models.Index(fields=['status', 'lease_expires_at'], name='workflowjob_lease_idx')],
+            },
+        ),
+    ]
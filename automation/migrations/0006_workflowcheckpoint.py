@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0005_workflowjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkflowCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64)),
+                ('name', models.CharField(max_length=100)),
+                ('url', models.TextField()),
+                ('storage_state', models.JSONField(default=dict)),
+                ('state', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('key', 'name'), name='checkpoint_unique_key_name')],
+            },
+        ),
+    ]
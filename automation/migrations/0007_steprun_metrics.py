@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0006_workflowcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='steprun',
+            name='metrics',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
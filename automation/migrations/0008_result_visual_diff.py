@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0007_steprun_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='visual_diff_heatmap',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='visual_diff_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
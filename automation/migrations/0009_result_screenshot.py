@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0008_result_visual_diff'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='screenshot',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0009_result_screenshot'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='result',
+            name='result_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='result',
+            name='result_passed_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['-created_at', '-id'], name='result_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['passed', '-created_at', '-id'], name='result_passed_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='steprun',
+            index=models.Index(fields=['-created_at', '-id'], name='steprun_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='steprun',
+            index=models.Index(fields=['run_id', '-created_at', '-id'], name='steprun_run_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:05
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q, Sum
+
+
+def backfill_runs(apps, schema_editor):
+    StepRun = apps.get_model('automation', 'StepRun')
+    WorkflowRun = apps.get_model('automation', 'WorkflowRun')
+    summaries = (
+        StepRun.objects.order_by()
+        .values('run_id')
+        .annotate(
+            steps=Count('id'),
+            failures=Count('id', filter=Q(passed=False)),
+            duration_ms=Sum('duration_ms'),
+            first=Min('created_at'),
+            last=Max('created_at'),
+        )
+        .iterator(chunk_size=2000)
+    )
+    batch = []
+    for s in summaries:
+        first_duration = (
+            StepRun.objects.filter(run_id=s['run_id'], created_at=s['first'])
+            .values_list('duration_ms', flat=True)
+            .first()
+        ) or 0
+        batch.append(
+            WorkflowRun(
+                run_id=s['run_id'],
+                status='FAIL' if s['failures'] else 'PASS',
+                steps=s['steps'],
+                failures=s['failures'],
+                duration_ms=s['duration_ms'] or 0,
+                started_at=s['first'] - timedelta(milliseconds=first_duration),
+                finished_at=s['last'],
+                created_at=s['last'],
+            )
+        )
+        if len(batch) >= 2000:
+            WorkflowRun.objects.bulk_create(batch)
+            batch = []
+    WorkflowRun.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0010_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkflowRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(max_length=32, unique=True)),
+                ('status', models.CharField(choices=[('PASS', 'Pass'), ('FAIL', 'Fail'), ('CANCELLED', 'Cancelled')], max_length=10)),
+                ('steps', models.PositiveIntegerField(default=0)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('duration_ms', models.FloatField(default=0)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='run_created_id_idx'), models.Index(fields=['status', '-created_at', '-id'], name='run_status_created_id_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_runs, migrations.RunPython.noop),
+    ]
@@ -6,12 +6,206 @@ class Result(models.Model):
     passed = models.BooleanField(default=False)
     comment = models.TextField(blank=True, null=True)
     url = models.URLField(blank=True, null=True, help_text="URL where the test was performed")
+    # Step screenshot, relative to MEDIA_ROOT (thumbnail: see
+    # automation.playwright.utils.thumbnails.thumbnail_path).
+    screenshot = models.CharField(max_length=500, blank=True, default="")
+    # Changed fraction of the step screenshot vs its visual baseline (0–1)
+    # and the heatmap of the changed pixels, relative to MEDIA_ROOT.
+    visual_diff_score = models.FloatField(blank=True, null=True)
+    visual_diff_heatmap = models.CharField(max_length=500, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        # (created_at, id) is the keyset of the results API.
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="result_created_id_idx"),
+            models.Index(
+                fields=["passed", "-created_at", "-id"],
+                name="result_passed_created_id_idx",
+            ),
+        ]
 
     def __str__(self):
         status = "PASS" if self.passed else "FAIL"
         return f"[{status}] {self.test_case}"
+
+
+class StepRun(models.Model):
+    """Append-only history: one row per executed step of every run."""
+
+    run_id = models.CharField(max_length=32, db_index=True)
+    test_case = models.CharField(max_length=500)
+    passed = models.BooleanField(default=False)
+    duration_ms = models.FloatField(default=0)
+    # Page-side performance of the step (BaseWorkflow collect_metrics):
+    # CDP Performance.getMetrics deltas, plus navigation / paint timing
+    # for steps that loaded a new document.
+    metrics = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["test_case", "created_at"], name="steprun_case_created_idx"
+            ),
+            models.Index(fields=["-created_at", "-id"], name="steprun_created_id_idx"),
+            models.Index(
+                fields=["run_id", "-created_at", "-id"],
+                name="steprun_run_created_id_idx",
+            ),
+        ]
+
+    def __str__(self):
+        status = "PASS" if self.passed else "FAIL"
+        return f"[{status}] {self.test_case} ({self.run_id})"
+
+
+class WorkflowRun(models.Model):
+    """One row per finished workflow run, summarising its StepRun rows."""
+
+    PASS = "PASS"
+    FAIL = "FAIL"
+    CANCELLED = "CANCELLED"
+    STATUS_CHOICES = [(PASS, "Pass"), (FAIL, "Fail"), (CANCELLED, "Cancelled")]
+
+    run_id = models.CharField(max_length=32, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    steps = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    duration_ms = models.FloatField(default=0)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="run_created_id_idx"),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="run_status_created_id_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"[{self.status}] {self.run_id} ({self.steps} steps)"
+
+
+class StepRollup(models.Model):
+    """
+    Pre-aggregated step statistics per hour / per day.
+
+    Maintained incrementally by automation.service.rollups when a workflow
+    finishes; rebuild with `manage.py rebuild_rollups`.
+    """
+
+    HOUR = "hour"
+    DAY = "day"
+    GRANULARITY_CHOICES = [(HOUR, "Hour"), (DAY, "Day")]
+
+    test_case = models.CharField(max_length=500)
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    period_start = models.DateTimeField()
+    total = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    duration_sum_ms = models.FloatField(default=0)
+    # Counts per bucket of automation.service.rollups.DURATION_BUCKETS_MS
+    duration_histogram = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ["-period_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["test_case", "granularity", "period_start"],
+                name="steprollup_unique_period",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["granularity", "period_start"],
+                name="steprollup_gran_period_idx",
+            ),
+        ]
+
+    def __str__(self):
+        period = f"{self.period_start:%Y-%m-%d %H:%M}"
+        return f"{self.test_case} @ {period} ({self.granularity})"
+
+    @property
+    def pass_rate(self):
+        return (self.total - self.failures) / self.total if self.total else None
+
+    @property
+    def mean_duration_ms(self):
+        return self.duration_sum_ms / self.total if self.total else None
+
+
+class WorkflowJob(models.Model):
+    """
+    A queued UserWorkflow run, claimed and executed by `manage.py run_worker`.
+
+    Workers claim jobs with a compare-and-set UPDATE and hold them under a
+    lease they keep extending via heartbeats; a job whose lease expires
+    (worker crashed or lost) is re-queued by the next worker that polls.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    params = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    worker_id = models.CharField(max_length=200, blank=True, default="")
+    run_id = models.CharField(max_length=32, blank=True, default="")
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "id"], name="workflowjob_status_idx"),
+            models.Index(
+                fields=["status", "lease_expires_at"], name="workflowjob_lease_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.pk} [{self.status}] {self.params}"
+
+
+class WorkflowCheckpoint(models.Model):
+    """Resume point saved by BaseWorkflow.save_checkpoint after a key step."""
+
+    key = models.CharField(max_length=64)
+    name = models.CharField(max_length=100)
+    url = models.TextField()
+    storage_state = models.JSONField(default=dict)
+    state = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key", "name"], name="checkpoint_unique_key_name"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.key}/{self.name}"
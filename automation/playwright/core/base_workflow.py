@@ -1,11 +1,91 @@
-import traceback
 import asyncio
 import concurrent.futures
+import contextvars
 import hashlib
+import json
+import os
 import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
 
-from automation.logging.logger import get_logger
+from automation.logging.logger import get_logger, log_context
+from automation.playwright.utils.perf_metrics import StepMetricsCollector
 from automation.playwright.utils.screenshot_manager import ScreenshotManager
+from automation.playwright.utils.thumbnails import schedule_thumbnail
+from automation.playwright.utils.trace_buffer import TraceRingBuffer
+from automation.playwright.utils.visual_diff import shared_visual_baseline
+from automation.service.step_events import broadcaster
+
+# Default for BaseWorkflow(collect_metrics=...): "1" samples page
+# performance around every step.
+COLLECT_STEP_METRICS = os.environ.get("AUTOMATION_STEP_METRICS", "") == "1"
+# Default for BaseWorkflow(trace_buffer=...): trace the last N steps and
+# keep them only when a step fails (0 = off).
+TRACE_BUFFER_STEPS = int(os.environ.get("AUTOMATION_TRACE_BUFFER", 0))
+# Default for BaseWorkflow(visual_baseline=...): "1" diffs every step
+# screenshot against its baseline (needs numpy + Pillow).
+VISUAL_BASELINE = os.environ.get("AUTOMATION_VISUAL_BASELINE", "") == "1"
+# Checkpoints (which hold the full cookie storage state) older than this
+# many seconds are not resumed from; `manage.py prune_checkpoints` deletes them.
+CHECKPOINT_MAX_AGE = int(os.environ.get("AUTOMATION_CHECKPOINT_MAX_AGE", 7 * 86400))
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _db_writer():
+    """Single long-lived thread for ORM writes issued from an event loop."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="db-writer"
+            )
+    return _writer
+
+
+class WorkflowCancelled(Exception):
+    """Raised by run_step when a stop was requested before the step began."""
+
+
+class WorkflowStep:
+    """
+    Declarative step for BaseWorkflow.run_step_graph().
+
+    after: keys of the steps that must finish first.
+    reads: optional JS function source, e.g. "() => location.href". A step
+           with reads is read-only: fn is called as fn(read_value, *args,
+           **kwargs) and must not touch the page, which lets independent
+           reads be batched into a single evaluate(). Its locator, if any,
+           is waited for (visible) before the batch reads the page.
+    key:   identifier used in `after` and in the returned dict (default: name).
+    """
+
+    def __init__(
+        self,
+        name,
+        fn,
+        *args,
+        key=None,
+        after=(),
+        reads=None,
+        locator=None,
+        reraise=True,
+        comment_fn=None,
+        **kwargs,
+    ):
+        self.name = name
+        self.key = key or name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.after = tuple(after)
+        self.reads = reads
+        self.locator = locator
+        self.reraise = reraise
+        self.comment_fn = comment_fn
 
 
 class BaseWorkflow:
@@ -19,9 +99,49 @@ class BaseWorkflow:
       - test_case_name is the human-readable step message stored as the DB key.
     """
 
-    def __init__(self, page):
+    def __init__(
+        self,
+        page,
+        stop_event=None,
+        checkpoint_key=None,
+        clear_browser_data=True,
+        step_prefix="",
+        collect_metrics=None,
+        trace_buffer=None,
+        visual_baseline=None,
+    ):
         self.page = page
+        # Prepended to every step name, e.g. "[Japan 2A] " in a sweep, so
+        # parallel scenarios don't overwrite each other's Result rows.
+        self.step_prefix = step_prefix
+        # False when the context comes from a clean ContextTemplate.
+        self.clear_browser_data = clear_browser_data
+        # threading.Event; once set, no further steps are started.
+        self.stop_event = stop_event
         self.logger = get_logger(self.__class__.__name__)
+        # Tags every log record of this run (see automation.logging.logger).
+        self.run_id = uuid.uuid4().hex[:12]
+        # Checkpoints are stored under checkpoint_key; passing one explicitly
+        # (e.g. a job id on retry) also means "resume from it if possible".
+        self.checkpoint_key = checkpoint_key or self.run_id
+        self.resume = checkpoint_key is not None
+        self._step_index = 0
+        # One entry per run_step call; flushed to StepRun/rollups at the end.
+        self.step_outcomes = []
+        if collect_metrics is None:
+            collect_metrics = COLLECT_STEP_METRICS
+        self.metrics = StepMetricsCollector(page) if collect_metrics else None
+        if trace_buffer is None:
+            trace_buffer = TRACE_BUFFER_STEPS
+        self.traces = (
+            TraceRingBuffer(page.context, trace_buffer) if trace_buffer else None
+        )
+        # True / False, or a VisualBaseline instance to use directly.
+        if visual_baseline is None:
+            visual_baseline = VISUAL_BASELINE
+        if visual_baseline is True:
+            visual_baseline = shared_visual_baseline()
+        self.visual = visual_baseline or None
 
     # ------------------------------------------------------------------
     # Logging helpers
@@ -31,8 +151,8 @@ class BaseWorkflow:
         self.logger.info(message)
 
     def log_error(self, error):
-        self.logger.error(str(error))
-        self.logger.error(traceback.format_exc())
+        # exc_info defers traceback formatting to the logging listener thread
+        self.logger.error(str(error), exc_info=True)
 
     # ------------------------------------------------------------------
     # Browser data management
@@ -107,47 +227,117 @@ class BaseWorkflow:
                 except Exception:
                     pass
 
+    def _generate_screenshot_filename(self, test_case_name: str) -> str:
+        return test_case_name.replace("/", "_") + ".png"
+
+    # ------------------------------------------------------------------
+    # Failure traces
+    # ------------------------------------------------------------------
+
+    def _persist_traces(self, screenshot_filename: str) -> str:
+        """Save the buffered trace chunks next to the failure screenshot."""
+        if self.traces is None:
+            return ""
+        stem = os.path.splitext(screenshot_filename)[0]
+        try:
+            saved = self.traces.persist(os.path.join(ScreenshotManager.BASE_DIR, stem))
+        except Exception as e:
+            self.logger.error(f"Trace capture failed: {e}")
+            return ""
+        if saved:
+            self.logger.info(f"Trace saved: {saved.replace('media/', '', 1)}")
+        return saved
+
+    def discard_traces(self):
+        """Drop the trace buffer; call once the run is over."""
+        if self.traces is not None:
+            self.traces.discard()
+
+    # ------------------------------------------------------------------
+    # Visual baselines
+    # ------------------------------------------------------------------
+
+    def _compare_visual(self, test_case_name: str, screenshot_path: str, passed=True):
+        """
+        Diff the step screenshot against its baseline; None if skipped.
+        Only PASS screenshots may become a baseline: an error page must not.
+        """
+        if self.visual is None or not screenshot_path:
+            return None
+        try:
+            diff = self.visual.compare(
+                test_case_name, "media/" + screenshot_path, create_baseline=passed
+            )
+        except Exception as e:
+            self.logger.error(f"Visual diff failed: {e}")
+            return None
+        if diff and diff["score"]:
+            self.logger.info(
+                f"Visual diff {diff['score']:.2%} vs baseline: {diff['heatmap']}"
+            )
+        return diff
+
     # ------------------------------------------------------------------
     # DB persistence
     # ------------------------------------------------------------------
 
+    def _result_defaults(self, passed, comment, screenshot_path, visual):
+        defaults = {
+            "passed": passed,
+            "comment": comment,
+            # Read on the caller's thread; Playwright objects stay there.
+            "url": self.page.url if self.page else "",
+            "screenshot": screenshot_path,
+        }
+        if visual is not None:
+            defaults["visual_diff_score"] = visual["score"]
+            defaults["visual_diff_heatmap"] = visual["heatmap"].replace(
+                "media/", "", 1
+            )
+        return defaults
+
+    def _log_saved(self, test_case_name, passed, created, screenshot_path):
+        status = "PASS" if passed else "FAIL"
+        action = "Created" if created else "Updated"
+        self.logger.info(
+            f"{action} DB result → [{status}] {test_case_name} | Screenshot: {screenshot_path}"
+        )
+
     def _save_result(
         self,
         test_case_name: str,
         passed: bool,
         comment: str = "",
         screenshot_path: str = "",
+        visual=None,
     ):
         """
         Upsert a Result row keyed on test_case_name.
 
-        Django's ORM is synchronous. If this method is called from inside a
-        running asyncio event loop (async view, Django Channels, ASGI server),
-        the ORM will raise SynchronousOnlyOperation. We detect this and push
-        the write into a ThreadPoolExecutor so it runs in a plain sync thread
-        with its own database connection, which is always safe.
+        Returns the Result. Inside a running asyncio event loop (async view,
+        Django Channels, ASGI server) the ORM would raise
+        SynchronousOnlyOperation, so the write is handed to the process-wide
+        DB writer thread instead and an asyncio.Future resolving to the
+        Result is returned without blocking the loop: await it, or let it
+        run (failures are logged). The write runs in a copy of the caller's
+        context, so its log lines keep the run and step ids. Coroutines can
+        also await _asave_result(), which uses the ORM's async API.
         """
         from automation.models import Result  # lazy — safe outside Django
 
-        def _db_write():
-            # Capture current page URL
-            current_url = self.page.url if self.page else ""
+        defaults = self._result_defaults(passed, comment, screenshot_path, visual)
 
+        def _db_write():
             result, created = Result.objects.update_or_create(
                 test_case=test_case_name,
-                defaults={
-                    "passed": passed,
-                    "comment": comment,
-                    "url": current_url,
-                },
-            )
-            status = "PASS" if passed else "FAIL"
-            action = "Created" if created else "Updated"
-            self.logger.info(
-                f"{action} DB result → [{status}] {test_case_name} | Screenshot: {screenshot_path}"
+                defaults=defaults,
             )
+            self._log_saved(test_case_name, passed, created, screenshot_path)
             return result
 
+        # WebP thumbnail for the admin list, rendered on a background thread.
+        schedule_thumbnail(screenshot_path)
+
         # Detect whether we're inside a running event loop.
         # asyncio.get_running_loop() raises RuntimeError if there is none.
         try:
@@ -156,16 +346,141 @@ class BaseWorkflow:
             loop = None
 
         if loop and loop.is_running():
-            # Async context (ASGI view, Channels consumer, etc.)
-            # Run the synchronous DB write in a worker thread so Django's
-            # async guard doesn't fire and we don't block the event loop.
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-                future = pool.submit(_db_write)
-                return future.result()  # blocks this thread until DB write done
+            # Async context: queue on the shared writer (one long-lived
+            # thread with its own connection) and let the loop carry on.
+            context = contextvars.copy_context()
+            future = asyncio.wrap_future(
+                _db_writer().submit(context.run, _db_write), loop=loop
+            )
+            future.add_done_callback(self._log_write_failure)
+            return future
         else:
             # Plain sync context — call directly, no overhead
             return _db_write()
 
+    def _log_write_failure(self, future):
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            self.logger.error(f"Background DB write failed: {exc}")
+
+    async def _asave_result(
+        self,
+        test_case_name: str,
+        passed: bool,
+        comment: str = "",
+        screenshot_path: str = "",
+        visual=None,
+    ):
+        """Async twin of _save_result: returns the Result via aupdate_or_create."""
+        from automation.models import Result  # lazy — safe outside Django
+
+        defaults = self._result_defaults(passed, comment, screenshot_path, visual)
+        schedule_thumbnail(screenshot_path)
+        result, created = await Result.objects.aupdate_or_create(
+            test_case=test_case_name,
+            defaults=defaults,
+        )
+        self._log_saved(test_case_name, passed, created, screenshot_path)
+        return result
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def save_checkpoint(self, name: str, state: dict):
+        """
+        Persist enough to resume after `name`: the browser storage state
+        (cookies + localStorage), the current URL and the workflow's own
+        choices in `state` (must be JSON serialisable).
+        """
+        from automation.models import WorkflowCheckpoint  # lazy — safe outside Django
+
+        try:
+            WorkflowCheckpoint.objects.update_or_create(
+                key=self.checkpoint_key,
+                name=name,
+                defaults={
+                    "url": self.page.url,
+                    "storage_state": self.page.context.storage_state(),
+                    "state": state,
+                },
+            )
+            self.logger.info(f"Checkpoint saved: {self.checkpoint_key}/{name}")
+        except Exception as e:
+            self.logger.warning(f"Failed to save checkpoint {name}: {e}")
+
+    def load_checkpoint(self, name: str):
+        """Return {"url", "storage_state", "state"} or None."""
+        from automation.models import WorkflowCheckpoint  # lazy — safe outside Django
+
+        checkpoint = WorkflowCheckpoint.objects.filter(
+            key=self.checkpoint_key, name=name
+        ).first()
+        if checkpoint is None:
+            return None
+        age = (datetime.now(timezone.utc) - checkpoint.created_at).total_seconds()
+        if age > CHECKPOINT_MAX_AGE:
+            self.logger.info(
+                f"Checkpoint {self.checkpoint_key}/{name} expired ({age / 3600:.0f} h old)"
+            )
+            checkpoint.delete()
+            return None
+
+        self.logger.info(f"Resuming from checkpoint {self.checkpoint_key}/{name}")
+        return {
+            "url": checkpoint.url,
+            "storage_state": checkpoint.storage_state,
+            "state": checkpoint.state,
+        }
+
+    def restore_checkpoint_storage(self, checkpoint):
+        """Load the checkpoint's cookies and localStorage into this context."""
+        storage = checkpoint.get("storage_state") or {}
+        if storage.get("cookies"):
+            self.page.context.add_cookies(storage["cookies"])
+
+        origins = {
+            o["origin"]: {item["name"]: item["value"] for item in o["localStorage"]}
+            for o in storage.get("origins", [])
+        }
+        if origins:
+            # Runs before any page script, on every navigation of the context.
+            self.page.context.add_init_script(
+                script=(
+                    "(() => {"
+                    f"  const origins = {json.dumps(origins)};"
+                    "  const items = origins[window.location.origin] || {};"
+                    "  for (const [k, v] of Object.entries(items)) {"
+                    "    if (localStorage.getItem(k) === null) localStorage.setItem(k, v);"
+                    "  }"
+                    "})()"
+                )
+            )
+
+    def clear_checkpoints(self):
+        from automation.models import WorkflowCheckpoint  # lazy — safe outside Django
+
+        try:
+            WorkflowCheckpoint.objects.filter(key=self.checkpoint_key).delete()
+        except Exception as e:
+            self.logger.warning(f"Failed to clear checkpoints: {e}")
+
+    def _record_outcome(
+        self, test_case_name: str, passed: bool, duration_ms: float, metrics=None
+    ):
+        self.step_outcomes.append(
+            {
+                "run_id": self.run_id,
+                "test_case": test_case_name,
+                "passed": passed,
+                "duration_ms": duration_ms,
+                "metrics": metrics,
+                "finished_at": datetime.now(timezone.utc),
+            }
+        )
+
     # ------------------------------------------------------------------
     # Core step runner
     # ------------------------------------------------------------------
@@ -198,59 +513,315 @@ class BaseWorkflow:
                    Example: lambda props: f"found property: {props}"
 
         Returns fn's return value on success, None on swallowed failure.
+        Raises WorkflowCancelled (without recording anything) if stop_event
+        is set, so a shutdown lets the in-flight step finish but starts no
+        new ones.
         """
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise WorkflowCancelled(
+                f"Stop requested before step: {test_case_name}"
+            )
+
+        test_case_name = self.step_prefix + test_case_name
+        self._step_index += 1
+        with log_context(run_id=self.run_id, step_id=self._step_index):
+            return self._run_step(
+                test_case_name,
+                fn,
+                *args,
+                locator=locator,
+                reraise=reraise,
+                comment_fn=comment_fn,
+                **kwargs,
+            )
+
+    def _run_step(
+        self,
+        test_case_name: str,
+        fn,
+        *args,
+        locator=None,
+        reraise: bool = True,
+        comment_fn=None,
+        **kwargs,
+    ):
         self.logger.info(f"▶ Step: {test_case_name}")
-        screenshot_path = ""
+        self._publish_step("start", test_case_name)
+        # Sample the page the step acts on (e.g. a property tab).
+        step_page = locator.page if locator is not None else self.page
+        metrics_before = self.metrics.begin(step_page) if self.metrics else None
+        if self.traces:
+            self.traces.begin(test_case_name)
+        started = time.perf_counter()
 
         try:
             return_value = fn(*args, **kwargs)
+            duration_ms = (time.perf_counter() - started) * 1000
+            if self.traces:
+                self.traces.end(test_case_name)
+            metrics = self.metrics.end(metrics_before) if self.metrics else None
 
             # ── PASS ──────────────────────────────────────────────────────────
             # Take screenshot (full-page with locator highlight if provided)
-            try:
-                screenshot_filename = test_case_name + ".png"
-                screenshot_path = ScreenshotManager.take(self.page, screenshot_filename)
-                screenshot_path = screenshot_path.replace("media/", "", 1)
-                self.logger.info(f"Screenshot saved: {screenshot_path}")
-            except Exception as ss_exc:
-                self.logger.error(f"Screenshot capture failed: {ss_exc}")
-                screenshot_path = ""
-
-            # Generate custom comment
-            comment = comment_fn(return_value) if comment_fn else ""
-
-            # Save to DB
-            self._save_result(
+            screenshot_path = self._take_step_screenshot(test_case_name + ".png")
+            return self._step_passed(
                 test_case_name,
-                passed=True,
-                comment=comment,
+                return_value,
+                comment_fn,
+                duration_ms,
+                screenshot_path,
+                metrics=metrics,
             )
-            self.logger.info(f"✔ {test_case_name}")
-            return return_value
 
         except Exception as exc:
-            tb = traceback.format_exc()
-            self.logger.error(f"✘ {test_case_name}: {exc}")
-            self.logger.error(tb)
+            duration_ms = (time.perf_counter() - started) * 1000
+            metrics = self.metrics.end(metrics_before) if self.metrics else None
+            if self.traces:
+                self.traces.end(test_case_name)
+            self.logger.error(f"✘ {test_case_name}: {exc}", exc_info=True)
 
             # ── FAIL ──────────────────────────────────────────────────────────
             # Take screenshot (full-page with locator highlight if provided)
             try:
                 screenshot_filename = self._generate_screenshot_filename(test_case_name)
-                screenshot_path = ScreenshotManager.take(self.page, screenshot_filename)
-                screenshot_path = screenshot_path.replace("media/", "", 1)
-                self.logger.info(f"Screenshot saved: {screenshot_path}")
             except Exception as ss_exc:
                 self.logger.error(f"Screenshot capture failed: {ss_exc}")
-                screenshot_path = ""
-
-            # Save to DB with error message as comment
-            self._save_result(
-                test_case_name,
-                passed=False,
-                comment=str(exc),
+                screenshot_filename = None
+            screenshot_path = (
+                self._take_step_screenshot(screenshot_filename)
+                if screenshot_filename
+                else ""
+            )
+            self._step_failed(
+                test_case_name, exc, duration_ms, screenshot_path, metrics=metrics
             )
 
             if reraise:
                 raise
             return None
+
+    def _take_step_screenshot(self, screenshot_filename: str) -> str:
+        try:
+            screenshot_path = ScreenshotManager.take(self.page, screenshot_filename)
+            screenshot_path = screenshot_path.replace("media/", "", 1)
+            self.logger.info(f"Screenshot saved: {screenshot_path}")
+            return screenshot_path
+        except Exception as ss_exc:
+            self.logger.error(f"Screenshot capture failed: {ss_exc}")
+            return ""
+
+    def _publish_step(self, event_type, test_case_name, step_index=None, **data):
+        broadcaster.publish(
+            self.run_id,
+            event_type,
+            step=test_case_name,
+            step_index=step_index or self._step_index,
+            **data,
+        )
+
+    def _step_passed(
+        self,
+        test_case_name,
+        return_value,
+        comment_fn,
+        duration_ms,
+        screenshot_path,
+        metrics=None,
+    ):
+        # Generate custom comment
+        comment = comment_fn(return_value) if comment_fn else ""
+
+        # Save to DB
+        self._save_result(
+            test_case_name,
+            passed=True,
+            comment=comment,
+            screenshot_path=screenshot_path,
+            visual=self._compare_visual(test_case_name, screenshot_path),
+        )
+        self._record_outcome(test_case_name, True, duration_ms, metrics)
+        self._publish_step(
+            "pass", test_case_name, duration_ms=duration_ms, screenshot=screenshot_path
+        )
+        self.logger.info(f"✔ {test_case_name}")
+        return return_value
+
+    def _step_failed(
+        self, test_case_name, exc, duration_ms, screenshot_path, metrics=None
+    ):
+        self._persist_traces(self._generate_screenshot_filename(test_case_name))
+
+        # Save to DB with error message as comment
+        self._save_result(
+            test_case_name,
+            passed=False,
+            comment=str(exc),
+            screenshot_path=screenshot_path,
+            visual=self._compare_visual(
+                test_case_name, screenshot_path, passed=False
+            ),
+        )
+        self._record_outcome(test_case_name, False, duration_ms, metrics)
+        self._publish_step(
+            "fail",
+            test_case_name,
+            duration_ms=duration_ms,
+            screenshot=screenshot_path,
+            error=str(exc),
+        )
+
+    # ------------------------------------------------------------------
+    # Declarative step graph
+    # ------------------------------------------------------------------
+
+    def run_step_graph(self, steps):
+        """
+        Run WorkflowSteps in dependency order; returns {step.key: value}.
+
+        Steps whose `after` keys are all done form a level. Read-only steps
+        of a level (those declaring `reads`) are executed as one batch: their
+        locators are waited for, the page is read once with a single combined
+        evaluate() and captured in one screenshot, then every step's check
+        runs on its slice of that snapshot. A batch therefore costs one
+        browser round trip plus one screenshot, not one of each per step.
+        Each batched step is recorded with its own wait and check time plus
+        an even share of the read; metrics and the trace chunk of the batch
+        go with its first step. Remaining steps of the level run one by one
+        through run_step, after the batch.
+        """
+        keys = {step.key for step in steps}
+        for step in steps:
+            unknown = set(step.after) - keys
+            if unknown:
+                raise ValueError(f"Step '{step.key}' depends on unknown {unknown}")
+
+        done = {}
+        pending = list(steps)
+        while pending:
+            ready = [s for s in pending if all(d in done for d in s.after)]
+            if not ready:
+                raise ValueError(
+                    f"Cyclic step dependencies: {[s.key for s in pending]}"
+                )
+
+            batch = [s for s in ready if s.reads]
+            if batch:
+                done.update(self._run_read_batch(batch))
+
+            for step in ready:
+                if step.reads:
+                    continue
+                done[step.key] = self.run_step(
+                    step.name,
+                    step.fn,
+                    *step.args,
+                    locator=step.locator,
+                    reraise=step.reraise,
+                    comment_fn=step.comment_fn,
+                    **step.kwargs,
+                )
+
+            pending = [s for s in pending if s not in ready]
+
+        return done
+
+    def _run_read_batch(self, batch):
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise WorkflowCancelled(
+                f"Stop requested before step: {batch[0].name}"
+            )
+
+        names = [self.step_prefix + step.name for step in batch]
+        self.logger.info(f"▶ Batched read-only steps: {names}")
+        for offset, name in enumerate(names, start=1):
+            self._publish_step("start", name, step_index=self._step_index + offset)
+
+        # Metrics and one trace chunk cover the whole batch; the metrics are
+        # recorded on its first step, a failing step persists the trace once.
+        metrics_before = self.metrics.begin() if self.metrics else None
+        batch_title = f"{names[0]} (+{len(names) - 1} batched)"
+        if self.traces:
+            self.traces.begin(batch_title)
+
+        # ── Auto-wait for what each step reads, like inner_text() would ───
+        waits = []
+        for step in batch:
+            started = time.perf_counter()
+            error = None
+            if step.locator is not None:
+                try:
+                    step.locator.wait_for(state="visible")
+                except Exception as e:
+                    error = str(e)
+            waits.append(((time.perf_counter() - started) * 1000, error))
+
+        # ── One round trip for every read of the batch ────────────────────
+        started = time.perf_counter()
+        script = (
+            "() => ["
+            + ",".join(
+                "(() => { try { return {value: (" + step.reads + ")()}; }"
+                " catch (e) { return {error: String(e)}; } })()"
+                for step in batch
+            )
+            + "]"
+        )
+        try:
+            snapshot = self.page.evaluate(script)
+        except Exception as e:
+            snapshot = [{"error": str(e)}] * len(batch)
+        # The shared read is split evenly, so rollups add up to wall time.
+        read_share_ms = (time.perf_counter() - started) * 1000 / len(batch)
+
+        # ── One screenshot, copied under every step's name ────────────────
+        shared_path = self._take_step_screenshot(names[0] + ".png")
+        screenshot_paths = [shared_path]
+        for name in names[1:]:
+            if shared_path:
+                copied = ScreenshotManager.copy(shared_path, name + ".png")
+                screenshot_paths.append(copied.replace("media/", "", 1))
+            else:
+                screenshot_paths.append("")
+        if self.traces:
+            self.traces.end(batch_title)
+        batch_metrics = self.metrics.end(metrics_before) if self.metrics else None
+
+        results = {}
+        first_error = None
+        rows = zip(batch, names, snapshot, waits, screenshot_paths)
+        for position, (step, name, read, wait, screenshot_path) in enumerate(rows):
+            wait_ms, wait_error = wait
+            self._step_index += 1
+            metrics = batch_metrics if position == 0 else None
+            with log_context(run_id=self.run_id, step_id=self._step_index):
+                check_started = time.perf_counter()
+                try:
+                    if wait_error is not None:
+                        raise Exception(f"Waiting for page failed: {wait_error}")
+                    if "error" in read:
+                        raise Exception(f"Page read failed: {read['error']}")
+                    value = step.fn(read.get("value"), *step.args, **step.kwargs)
+                    check_ms = (time.perf_counter() - check_started) * 1000
+                    results[step.key] = self._step_passed(
+                        name,
+                        value,
+                        step.comment_fn,
+                        wait_ms + read_share_ms + check_ms,
+                        screenshot_path,
+                        metrics=metrics,
+                    )
+                except Exception as exc:
+                    check_ms = (time.perf_counter() - check_started) * 1000
+                    duration_ms = wait_ms + read_share_ms + check_ms
+                    self.logger.error(f"✘ {name}: {exc}", exc_info=True)
+                    self._step_failed(
+                        name, exc, duration_ms, screenshot_path, metrics=metrics
+                    )
+                    results[step.key] = None
+                    if step.reraise and first_error is None:
+                        first_error = exc
+
+        # Every step of the batch is recorded before a failure halts the run.
+        if first_error is not None:
+            raise first_error
+        return results
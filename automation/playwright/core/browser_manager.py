@@ -1,20 +1,303 @@
-from playwright.sync_api import sync_playwright
+import os
+import time
+
+from automation.logging.logger import get_logger
+from automation.playwright.core.launch_profile import DEFAULT_PROFILE
+
+logger = get_logger("BrowserManager")
+
+ENGINES = ("chromium", "firefox", "webkit")
+
+
+def process_rss_bytes(pid):
+    """Resident set size of one process from /proc, 0 if unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class ResourceLimits:
+    """
+    Thresholds for BrowserManager's resource governor; None disables one.
+
+    reuse_context:      keep one context across runs (warm HTTP cache)
+                        instead of a fresh context per run. Only then do
+                        max_context_runs / max_context_age apply.
+    max_context_runs:   recycle the context after this many runs.
+    max_context_age:    ... or once it is this many seconds old.
+    max_browser_runs:   relaunch the browser after this many runs.
+    max_browser_rss_mb: ... or once the browser's processes (browser,
+                        renderers, GPU) use this much resident memory
+                        (Chromium only: read through CDP).
+    """
+
+    def __init__(
+        self,
+        reuse_context=False,
+        max_context_runs=None,
+        max_context_age=None,
+        max_browser_runs=None,
+        max_browser_rss_mb=None,
+    ):
+        self.reuse_context = reuse_context
+        self.max_context_runs = max_context_runs
+        self.max_context_age = max_context_age
+        self.max_browser_runs = max_browser_runs
+        self.max_browser_rss_mb = max_browser_rss_mb
 
 
 class BrowserManager:
-    def __init__(self, headless=False):
+    """
+    Owns one Playwright driver + browser.
+
+    Used as a context manager it behaves as before: a single context/page
+    for the lifetime of the block. Long-lived callers (the daemon) keep the
+    browser warm and call new_page() to get a fresh, isolated context for
+    every run instead of relaunching Chromium.
+
+    engine: "chromium" (default), "firefox" or "webkit".
+
+    launch_profile: optional LaunchProfile (e.g. LEAN_PROFILE) with launch
+    args, headless mode, viewport and motion settings.
+
+    context_template: optional ContextTemplate; new contexts are then
+    created from its saved storage state, locale and viewport.
+
+    resource_limits: optional ResourceLimits. Long-lived callers call
+    end_run() after every run; it closes tabs the run left open and
+    recycles the context or the whole browser once a threshold is crossed.
+    Recycle events are logged and counted in self.recycles.
+
+    http_cache: optional HttpDiskCache shared across contexts (and
+    processes); every new context routes its static assets through it.
+    take_cache_stats() returns and resets the current run's hit counts.
+    """
+
+    def __init__(
+        self,
+        headless=False,
+        context_template=None,
+        resource_limits=None,
+        engine="chromium",
+        launch_profile=None,
+        http_cache=None,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+        self.engine = engine
+        self.profile = launch_profile or DEFAULT_PROFILE
         self.headless = headless
+        self.context_template = context_template
+        self.limits = resource_limits or ResourceLimits()
+        self.http_cache = http_cache
+        self.cache_stats = None
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+
+        self._browser_cdp = None
+        self._browser_runs = 0
+        self._context_runs = 0
+        self._context_started = None
+        self.recycles = {"orphan_tabs": 0, "context": 0, "browser": 0}
+
+    def start(self):
+        # Imported here so modules that only reference BrowserManager (job
+        # queue, management commands) don't load Playwright at startup.
+        from playwright.sync_api import sync_playwright
 
-    def __enter__(self):
         self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=self.headless)
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
+        self._launch()
+        return self
+
+    def _launch(self):
+        browser_type = getattr(self.playwright, self.engine)
+        self.browser = browser_type.launch(
+            **self.profile.launch_options(self.engine, self.headless)
+        )
+        self._browser_cdp = None
+        self._browser_runs = 0
 
+    def new_page(self):
+        """
+        Open a page for the next run: in a fresh context, or with
+        reuse_context in the current one while it is under its limits.
+        """
+        if self.limits.reuse_context and self.context is not None:
+            self._close_pages()
+            self.page = self.context.new_page()
+            return self.page
+
+        self.close_context()
+        if self.context_template is not None:
+            storage_state = self.context_template.ensure(self.browser)
+            self.context = self.browser.new_context(
+                storage_state=storage_state,
+                **{
+                    **self.context_template.context_options(),
+                    **self.profile.context_options(),
+                },
+            )
+        else:
+            self.context = self.browser.new_context(**self.profile.context_options())
+        self.profile.prepare_context(self.context)
+        if self.http_cache is not None:
+            self.cache_stats = self.http_cache.attach(self.context)
+        self._context_runs = 0
+        self._context_started = time.monotonic()
+        self.page = self.context.new_page()
         return self.page
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
+    @property
+    def template_is_clean(self):
+        # A reused context carries the previous run's storage.
+        return (
+            self.context_template is not None
+            and self.context_template.is_clean
+            and not self.limits.reuse_context
+        )
+
+    def take_cache_stats(self):
+        """HTTP cache counters since the last call (None without a cache)."""
+        if self.cache_stats is None:
+            return None
+        stats = self.cache_stats.as_dict()
+        logger.info(f"HTTP cache: {self.cache_stats}")
+        self.cache_stats.reset()
+        return stats
+
+    def close_context(self):
+        if self.context:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+        self.context = None
+        self.page = None
+
+    # ------------------------------------------------------------------
+    # Resource governor
+    # ------------------------------------------------------------------
+
+    def _close_pages(self, keep=None):
+        closed = 0
+        for page in list(self.context.pages):
+            if page is keep:
+                continue
+            try:
+                page.close()
+                closed += 1
+            except Exception:
+                pass
+        return closed
+
+    def browser_rss_bytes(self):
+        """Total RSS of the browser's processes; 0 if it cannot be read."""
+        try:
+            if self._browser_cdp is None:
+                self._browser_cdp = self.browser.new_browser_cdp_session()
+            info = self._browser_cdp.send("SystemInfo.getProcessInfo")
+        except Exception as e:
+            logger.warning(f"Browser process info unavailable: {e}")
+            return 0
+        return sum(process_rss_bytes(p["id"]) for p in info.get("processInfo", []))
+
+    def _browser_recycle_reason(self):
+        limits = self.limits
+        if limits.max_browser_runs and self._browser_runs >= limits.max_browser_runs:
+            return f"{self._browser_runs} runs"
+        if limits.max_browser_rss_mb and self.engine == "chromium":
+            rss_mb = self.browser_rss_bytes() / (1024 * 1024)
+            if rss_mb >= limits.max_browser_rss_mb:
+                return f"RSS {rss_mb:.0f} MB"
+        return None
+
+    def _context_recycle_reason(self):
+        limits = self.limits
+        if not limits.reuse_context:
+            return "per-run context"
+        if limits.max_context_runs and self._context_runs >= limits.max_context_runs:
+            return f"{self._context_runs} runs"
+        age = time.monotonic() - self._context_started
+        if limits.max_context_age and age >= limits.max_context_age:
+            return f"age {age:.0f}s"
+        return None
+
+    def end_run(self):
+        """
+        Housekeeping after every run of a long-lived browser: close the
+        tabs the run opened (e.g. property pages), then recycle the
+        context and/or browser when a threshold is crossed. If that fails
+        (e.g. the relaunch), driver and browser are restarted from scratch;
+        only a failing restart raises.
+        """
+        try:
+            self._end_run()
+        except Exception as e:
+            logger.error(f"Browser recycle failed ({e}), restarting", exc_info=True)
+            self.restart()
+
+    def _end_run(self):
+        self._browser_runs += 1
+        self._context_runs += 1
+        self.take_cache_stats()
+
+        if self.context is not None:
+            orphans = self._close_pages(keep=self.page)
+            if orphans:
+                self.recycles["orphan_tabs"] += orphans
+                logger.info(f"Closed {orphans} orphaned tab(s)")
+
+        browser_reason = self._browser_recycle_reason()
+        if browser_reason:
+            self.close_context()
+            self.recycles["browser"] += 1
+            logger.info(
+                f"Recycling browser ({browser_reason}), recycles: {self.recycles}"
+            )
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+            self._launch()
+            return
+
+        context_reason = self._context_recycle_reason()
+        if context_reason and self.context is not None:
+            self.close_context()
+            if self.limits.reuse_context:
+                self.recycles["context"] += 1
+                logger.info(
+                    f"Recycling context ({context_reason}), recycles: {self.recycles}"
+                )
+
+    def restart(self):
+        """Tear down whatever is left of the driver and browser, then start again."""
+        try:
+            self.stop()
+        except Exception as e:
+            logger.warning(f"Browser teardown before restart failed: {e}")
+            self.browser = None
+            self.playwright = None
+        self.recycles["browser"] += 1
+        return self.start()
+
+    def stop(self):
+        self.close_context()
         if self.browser:
             self.browser.close()
+            self.browser = None
         if self.playwright:
             self.playwright.stop()
+            self.playwright = None
+
+    def __enter__(self):
+        self.start()
+        return self.new_page()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
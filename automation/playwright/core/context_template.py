@@ -0,0 +1,147 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from automation.logging.logger import get_logger
+
+logger = get_logger("ContextTemplate")
+
+# Interstitials that appear on a first visit (cookie consent, "Got it" tips).
+DISMISS_BUTTONS = ("Accept all", "OK", "Got it")
+# The only cookies a template keeps: consent choices and locale / currency
+# preferences. Session, device and tracking cookies are dropped.
+CLEAN_COOKIE_NAMES = re.compile(
+    r"^(optanon\w*|\w*consent\w*|locale|lang(uage)?|currency|country)$", re.I
+)
+
+
+def clean_storage_state(state):
+    """Copy of a storage state with only allowlisted cookies and no origin storage."""
+    return {
+        "cookies": [
+            c for c in state.get("cookies", []) if CLEAN_COOKIE_NAMES.match(c["name"])
+        ],
+        "origins": [],
+    }
+
+
+def is_clean_storage_state(state):
+    return not state.get("origins") and all(
+        CLEAN_COOKIE_NAMES.match(c["name"]) for c in state.get("cookies", [])
+    )
+
+
+class ContextTemplate:
+    """
+    A saved, already-settled browser context to clone new contexts from.
+
+    build() opens the site once with the configured locale and viewport,
+    dismisses the consent / "Got it" interstitials and saves the resulting
+    storage state to disk. ensure() returns that file, rebuilding it when it
+    is older than max_age, so BrowserManager.new_page() only has to call
+    browser.new_context(storage_state=...) — a few milliseconds — instead of
+    replaying first-visit UI on every run.
+
+    Before saving, the state is reduced to consent and locale cookies
+    (CLEAN_COOKIE_NAMES) with no localStorage, so no session or tracking id
+    is shared between runs. is_clean checks the saved file itself; only then
+    may callers skip the per-run _clear_browser_data().
+    """
+
+    BASE_DIR = "media/automation/context_templates"
+
+    def __init__(
+        self,
+        name="default",
+        url="https://www.airbnb.com",
+        locale="en-US",
+        timezone_id=None,
+        viewport=None,
+        max_age=3600,
+    ):
+        self.name = name
+        self.url = url
+        self.locale = locale
+        self.timezone_id = timezone_id
+        self.viewport = viewport or {"width": 1280, "height": 800}
+        self.max_age = max_age
+        self.path = os.path.join(self.BASE_DIR, f"{name}.json")
+        self._lock = threading.Lock()
+        self._clean = (None, False)  # (mtime checked, result)
+
+    @property
+    def is_clean(self):
+        """True if the saved state holds nothing but allowlisted cookies."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if self._clean[0] != mtime:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    clean = is_clean_storage_state(json.load(f))
+            except (OSError, ValueError):
+                clean = False
+            self._clean = (mtime, clean)
+        return self._clean[1]
+
+    def context_options(self):
+        options = {"locale": self.locale, "viewport": self.viewport}
+        if self.timezone_id:
+            options["timezone_id"] = self.timezone_id
+        return options
+
+    def age(self):
+        try:
+            return time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def is_fresh(self):
+        age = self.age()
+        return age is not None and age < self.max_age
+
+    def build(self, browser):
+        started = time.perf_counter()
+        os.makedirs(self.BASE_DIR, exist_ok=True)
+
+        context = browser.new_context(**self.context_options())
+        try:
+            page = context.new_page()
+            page.goto(self.url, wait_until="domcontentloaded")
+
+            for name in DISMISS_BUTTONS:
+                try:
+                    button = page.get_by_role("button", name=name, exact=True)
+                    button.wait_for(state="visible", timeout=3000)
+                    button.click()
+                except Exception:
+                    pass
+
+            state = clean_storage_state(context.storage_state())
+        finally:
+            context.close()
+
+        # Write atomically so concurrent workers never read a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=self.BASE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+        logger.info(
+            f"Context template '{self.name}' built in "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        return self.path
+
+    def ensure(self, browser):
+        """Path of a fresh storage state file, rebuilding it if aged out."""
+        if self.is_fresh():
+            return self.path
+        with self._lock:
+            if not self.is_fresh():
+                self.build(browser)
+        return self.path
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from automation.logging.logger import get_logger
+
+logger = get_logger("HttpDiskCache")
+
+# Static assets worth keeping across runs (bundles, styles, fonts, images).
+STATIC_PATH = re.compile(
+    r"\.(js|mjs|css|woff2?|ttf|otf|png|jpe?g|webp|avif|gif|svg|ico)$", re.I
+)
+# Never replayed from the cache: hop-by-hop, describing the original bytes,
+# or cookies (which belong to the context that received them).
+DROP_HEADERS = {
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "connection",
+    "set-cookie",
+    "set-cookie2",
+}
+# Bodies are stored decoded, so the encoding a response varied on is moot.
+IGNORED_VARY = {"accept-encoding"}
+
+
+class CacheStats:
+    """Per-context counters (one context = one run)."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.bytes_fetched = 0
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 3),
+            "bytes_saved": self.bytes_saved,
+            "bytes_fetched": self.bytes_fetched,
+        }
+
+    def __str__(self):
+        return (
+            f"{self.hits}/{self.hits + self.misses} hits ({self.hit_ratio:.0%}), "
+            f"{self.bytes_saved / 1024 / 1024:.1f} MB saved"
+        )
+
+
+class HttpDiskCache:
+    """
+    Disk cache of static GET responses shared by every context and process.
+
+    Fresh contexts start with an empty browser cache, so every run would
+    download the site's bundles, CSS and sprites again. attach(context)
+    routes static asset requests through this cache instead: hits are
+    fulfilled from disk, misses are fetched and stored. Only response
+    bodies of public, cacheable static assets are kept — never cookies or
+    storage, and responses setting cookies are not cached at all — so runs
+    stay isolated. An entry is only reused for requests that match the
+    request headers its response varied on.
+
+    Entries live for max_age seconds (or less if the response says so).
+    When the directory grows past max_bytes the least recently used entries
+    are evicted down to 90% of it.
+    """
+
+    BASE_DIR = "media/automation/http_cache"
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, max_age=86400, base_dir=None):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.base_dir = base_dir or self.BASE_DIR
+        self._lock = threading.Lock()
+        self._written_since_evict = 0
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _path(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.base_dir, key[:2], key + ".bin")
+
+    def get(self, url, request_headers=None):
+        """(meta, body) of a fresh entry matching request_headers' Vary values, or None."""
+        path = self._path(url)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if time.time() > meta["expires"]:
+            return None
+        request_headers = request_headers or {}
+        for name, value in meta.get("vary", {}).items():
+            if request_headers.get(name, "") != value:
+                return None
+        try:
+            # mtime doubles as the LRU timestamp.
+            os.utime(path)
+        except OSError:
+            pass
+        return meta, body
+
+    def put(self, url, status, headers, body, ttl, vary=None):
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": headers,
+            "expires": time.time() + ttl,
+            "vary": vary or {},
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(meta).encode("utf-8") + b"\n")
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._written_since_evict += len(body)
+            due = self._written_since_evict > self.max_bytes // 20
+            if due:
+                self._written_since_evict = 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until under 90% of max_bytes."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.base_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        if total <= self.max_bytes:
+            return 0
+
+        target = self.max_bytes * 0.9
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        logger.info(f"HTTP cache evicted {removed} entries, {total / 1024 / 1024:.0f} MB left")
+        return removed
+
+    # ------------------------------------------------------------------
+    # Playwright routing
+    # ------------------------------------------------------------------
+
+    def _ttl(self, headers):
+        """Seconds a response may be reused without revalidation; 0 = don't store."""
+        if "set-cookie" in headers or "set-cookie2" in headers:
+            return 0
+        cache_control = headers.get("cache-control", "").lower()
+        if any(d in cache_control for d in ("no-store", "no-cache", "private")):
+            return 0
+        if "no-cache" in headers.get("pragma", "").lower():
+            return 0
+        match = re.search(r"max-age=(\d+)", cache_control)
+        if match:
+            return min(int(match.group(1)), self.max_age)
+        return self.max_age
+
+    @staticmethod
+    def _vary(response_headers, request_headers):
+        """{header: request value} the response varies on, or None for Vary: *."""
+        names = {
+            n.strip().lower()
+            for n in response_headers.get("vary", "").split(",")
+            if n.strip()
+        }
+        if "*" in names:
+            return None
+        return {n: request_headers.get(n, "") for n in sorted(names - IGNORED_VARY)}
+
+    @staticmethod
+    def _is_static(url):
+        return bool(STATIC_PATH.search(urlsplit(url).path))
+
+    def attach(self, context):
+        """Route the context's static assets through the cache; returns its stats."""
+        stats = CacheStats()
+
+        def handle(route):
+            request = route.request
+            if request.method != "GET":
+                route.fallback()
+                return
+
+            cached = self.get(request.url, request.headers)
+            if cached is not None:
+                meta, body = cached
+                stats.hits += 1
+                stats.bytes_saved += len(body)
+                route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+                return
+
+            stats.misses += 1
+            try:
+                response = route.fetch()
+                body = response.body()
+            except Exception:
+                route.fallback()
+                return
+            stats.bytes_fetched += len(body)
+            ttl = self._ttl(response.headers)
+            vary = self._vary(response.headers, request.headers)
+            if response.status == 200 and ttl > 0 and vary is not None:
+                stored = {
+                    k: v
+                    for k, v in response.headers.items()
+                    if k.lower() not in DROP_HEADERS
+                }
+                try:
+                    self.put(request.url, response.status, stored, body, ttl, vary)
+                except OSError as e:
+                    logger.warning(f"HTTP cache write failed: {e}")
+            # The live response goes to this context untouched (cookies included).
+            live = {
+                k: v
+                for k, v in response.headers.items()
+                if k.lower() not in DROP_HEADERS or k.lower().startswith("set-cookie")
+            }
+            route.fulfill(status=response.status, headers=live, body=body)
+
+        context.route(self._is_static, handle)
+        return stats
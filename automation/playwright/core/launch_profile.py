@@ -0,0 +1,106 @@
+import json
+
+# Chromium switches that cut background work irrelevant to a test run.
+LEAN_CHROMIUM_ARGS = (
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--mute-audio",
+)
+
+# Near-zero rather than zero durations: transitionend / animationend still
+# fire, so UI that waits for them (modals, the calendar) keeps working.
+NO_MOTION_CSS = (
+    "*, *::before, *::after {"
+    " transition-duration: 0.01ms !important;"
+    " transition-delay: 0s !important;"
+    " animation-duration: 0.01ms !important;"
+    " animation-delay: 0s !important;"
+    " animation-iteration-count: 1 !important;"
+    " scroll-behavior: auto !important;"
+    "}"
+)
+
+NO_MOTION_SCRIPT = (
+    "(() => {"
+    "  const add = () => {"
+    "    const style = document.createElement('style');"
+    "    style.id = 'automation-no-motion';"
+    f"    style.textContent = {json.dumps(NO_MOTION_CSS)};"
+    "    (document.head || document.documentElement).appendChild(style);"
+    "  };"
+    "  if (document.documentElement) add();"
+    "  else document.addEventListener('DOMContentLoaded', add);"
+    "})()"
+)
+
+
+class LaunchProfile:
+    """
+    How BrowserManager launches the browser and configures its contexts.
+
+    headless:           None keeps BrowserManager's own headless flag.
+    chromium_args:      extra launch switches (Chromium only).
+    viewport:           fixed viewport for every context (None = default).
+    reduced_motion:     emulate prefers-reduced-motion: reduce.
+    disable_animations: inject NO_MOTION_CSS into every page.
+    """
+
+    def __init__(
+        self,
+        name="default",
+        headless=None,
+        chromium_args=(),
+        viewport=None,
+        reduced_motion=False,
+        disable_animations=False,
+    ):
+        self.name = name
+        self.headless = headless
+        self.chromium_args = tuple(chromium_args)
+        self.viewport = viewport
+        self.reduced_motion = reduced_motion
+        self.disable_animations = disable_animations
+
+    def launch_options(self, engine, headless):
+        options = {"headless": headless if self.headless is None else self.headless}
+        if engine == "chromium" and self.chromium_args:
+            options["args"] = list(self.chromium_args)
+        return options
+
+    def context_options(self):
+        options = {}
+        if self.viewport:
+            options["viewport"] = self.viewport
+        if self.reduced_motion:
+            options["reduced_motion"] = "reduce"
+        return options
+
+    def prepare_context(self, context):
+        if self.disable_animations:
+            context.add_init_script(script=NO_MOTION_SCRIPT)
+
+
+DEFAULT_PROFILE = LaunchProfile()
+
+# Headless (Playwright's headless shell for Chromium), background features
+# off, the narrowest viewport that keeps Airbnb's desktop layout, and no
+# motion, so every click is followed by an immediately settled page.
+LEAN_PROFILE = LaunchProfile(
+    name="lean",
+    headless=True,
+    chromium_args=LEAN_CHROMIUM_ARGS,
+    viewport={"width": 1128, "height": 720},
+    reduced_motion=True,
+    disable_animations=True,
+)
+
+PROFILES = {"default": DEFAULT_PROFILE, "lean": LEAN_PROFILE}
@@ -46,6 +46,12 @@ class LandingPage:
         except Exception:
             return False
 
+    def open(self, url):
+        """Like goto(), but raises when the page does not load."""
+        if not self.goto(url):
+            raise Exception(f"Page did not load: {url}")
+        return True
+
     def handle_popups(self, timeout=5000):
         try:
             btn = self.page.get_by_role("button", name="Got it")
@@ -150,6 +156,33 @@ class LandingPage:
 
         return checkin["date"], checkout["date"]
 
+    def select_dates(self, checkin, checkout, max_clicks=24):
+        """
+        Click the given check-in / check-out dates ("YYYY-MM-DD"), paging
+        the calendar forward until each one is rendered.
+        """
+        self.calendar.wait_for()
+        forward_button = self.page.get_by_role(
+            "button", name="Move forward to switch to the"
+        )
+
+        for date_string in (checkin, checkout):
+            day = self.calendar.locator(
+                f'button[data-state--date-string="{date_string}"]'
+            )
+            clicks = 0
+            while day.count() == 0:
+                if clicks >= max_clicks:
+                    raise Exception(f"Date {date_string} not found in calendar")
+                forward_button.click()
+                self.page.wait_for_timeout(500)
+                clicks += 1
+            if day.first.is_disabled():
+                raise Exception(f"Date {date_string} is not available")
+            day.first.click()
+
+        return checkin, checkout
+
     def verify_selected_dates(self, check_in, check_out):
         expected = f"{format_airbnb_date(check_in)} - {format_airbnb_date(check_out)}"
 
@@ -170,11 +203,12 @@ class LandingPage:
     def click_guest_input(self):
         self.page.get_by_role("button", name="Who Add guests").click()
 
-    def set_guests(self):
-        adults = random.randint(3, 10)
-        children = random.randint(2, 5)
-        infants = random.randint(1, 3)
-        pets = random.randint(0, 2)
+    def set_guests(self, adults=None, children=None, infants=None, pets=None):
+        """Click the steppers; counts left as None are picked at random."""
+        adults = random.randint(3, 10) if adults is None else adults
+        children = random.randint(2, 5) if children is None else children
+        infants = random.randint(1, 3) if infants is None else infants
+        pets = random.randint(0, 2) if pets is None else pets
 
         adultsBtn = self.page.get_by_test_id("stepper-adults-increase-button")
         childrenBtn = self.page.get_by_test_id("stepper-children-increase-button")
@@ -1,6 +1,74 @@
 from automation.playwright.utils.helper import format_airbnb_date
+import json
 import random
 
+# Maps listing card elements to {title, price, images}. Shared by
+# extract_properties (Locator.evaluate_all) and PROPERTIES_READ.
+CARD_MAPPER = """
+(cards) => {
+    return cards.map(card => {
+
+        // ---- TITLE ----
+        const titleEl = card.querySelector('[data-testid="listing-card-title"]');
+        const title = titleEl ? titleEl.innerText.trim() : "";
+
+        // ---- PRICE (clean extraction) ----
+        let price = "";
+
+        const priceRow = card.querySelector('[data-testid="price-availability-row"]');
+
+        if (priceRow) {
+            // Get all text nodes inside price row
+            const text = priceRow.innerText;
+
+            // Extract first currency value like $12,345
+            const match = text.match(/\\$[\\d,]+/);
+
+            if (match) {
+                price = match[0];
+            }
+        }
+
+        // ---- IMAGES ----
+        const images = Array.from(card.querySelectorAll("picture img"))
+            .map(img => img.src)
+            .filter(Boolean);
+
+        const uniqueImages = [...new Set(images)];
+
+        return {
+            title,
+            price,
+            images: uniqueImages
+        };
+    });
+}
+"""
+
+# Read-only snapshots for WorkflowStep(reads=...) / run_step_graph batching.
+RESULTS_SUMMARY_READ = """
+() => {
+    const text = (id) => {
+        const el = document.querySelector(`[data-testid="${id}"]`);
+        return el ? el.innerText : null;
+    };
+    return {
+        url: window.location.href,
+        location: text("little-search-location"),
+        date: text("little-search-date"),
+        guests: text("little-search-guests"),
+    };
+}
+"""
+
+CARDS_SELECTOR = (
+    '[data-xray-jira-component="Guest: Listing Cards"] [data-testid="card-container"]'
+)
+PROPERTIES_READ = (
+    f"() => ({CARD_MAPPER})"
+    f"(Array.from(document.querySelectorAll({json.dumps(CARDS_SELECTOR)})))"
+)
+
 
 class ResultPage:
 
@@ -25,8 +93,40 @@ class ResultPage:
         children=None,
         infants=None,
     ):
+        summary = self.page.evaluate(RESULTS_SUMMARY_READ)
+        return self.check_results_summary(
+            summary,
+            location=location,
+            check_in=check_in,
+            check_out=check_out,
+            adults=adults,
+            children=children,
+            infants=infants,
+        )
 
-        url = self.page.url
+    @staticmethod
+    def _text(summary, key):
+        value = summary.get(key)
+        if value is None:
+            raise Exception(f"Search summary element '{key}' not found on page")
+        return value
+
+    @classmethod
+    def check_results_summary(
+        cls,
+        summary,
+        location=None,
+        check_in=None,
+        check_out=None,
+        adults=None,
+        children=None,
+        infants=None,
+    ):
+        """
+        Pure check of a RESULTS_SUMMARY_READ snapshot — never touches the
+        page, so it can run inside a batched read (see run_step_graph).
+        """
+        url = summary["url"]
         if "search" not in url:
             raise Exception(f"Not on results page, current URL: {url}")
 
@@ -34,7 +134,7 @@ class ResultPage:
 
         # ── URL CHECK: Location ────────────────────────────────────────────
         if location:
-            raw_text = self.page.get_by_test_id("little-search-location").inner_text()
+            raw_text = cls._text(summary, "location")
             normalized = " ".join(raw_text.split())
             parsed_locationType1 = normalized.replace("Location Homes in ", "").strip()
             parsed_locationType2 = normalized.replace("Location Homes near ", "").strip()
@@ -93,8 +193,7 @@ class ResultPage:
 
         # ── UI CHECK: Location Display ─────────────────────────────────────
         if location:
-            littleLocation = self.page.get_by_test_id("little-search-location")
-            raw_text = littleLocation.inner_text()
+            raw_text = cls._text(summary, "location")
             normalized = " ".join(raw_text.split())
             parsed_locationType1 = normalized.replace("Location Homes in ", "").strip()
             parsed_locationType2 = normalized.replace("Location Homes near ", "").strip()
@@ -108,8 +207,7 @@ class ResultPage:
 
         # ── UI CHECK: Date Display ─────────────────────────────────────────
         if check_in and check_out:
-            littleDate = self.page.get_by_test_id("little-search-date")
-            normalizedDate = " ".join(littleDate.inner_text().split())
+            normalizedDate = " ".join(cls._text(summary, "date").split())
 
             check_in_month = check_in.strftime("%b").strip()
             check_in_day = check_in.day
@@ -141,8 +239,7 @@ class ResultPage:
         if children is not None:
             guest_count += children
 
-        littleGuests = self.page.get_by_test_id("little-search-guests")
-        littleGuestsText = " ".join(littleGuests.inner_text().split())
+        littleGuestsText = " ".join(cls._text(summary, "guests").split())
 
         if f"{guest_count} guest" not in littleGuestsText:
             raise Exception(
@@ -163,46 +260,7 @@ class ResultPage:
         )
 
         properties = container.locator('[data-testid="card-container"]').evaluate_all(
-            """
-        (cards) => {
-            return cards.map(card => {
-
-                // ---- TITLE ----
-                const titleEl = card.querySelector('[data-testid="listing-card-title"]');
-                const title = titleEl ? titleEl.innerText.trim() : "";
-
-                // ---- PRICE (clean extraction) ----
-                let price = "";
-
-                const priceRow = card.querySelector('[data-testid="price-availability-row"]');
-
-                if (priceRow) {
-                    // Get all text nodes inside price row
-                    const text = priceRow.innerText;
-
-                    // Extract first currency value like $12,345
-                    const match = text.match(/\\$[\\d,]+/);
-
-                    if (match) {
-                        price = match[0];
-                    }
-                }
-
-                // ---- IMAGES ----
-                const images = Array.from(card.querySelectorAll("picture img"))
-                    .map(img => img.src)
-                    .filter(Boolean);
-
-                const uniqueImages = [...new Set(images)];
-
-                return {
-                    title,
-                    price,
-                    images: uniqueImages
-                };
-            });
-        }
-        """
+            CARD_MAPPER
         )
 
         return properties
@@ -0,0 +1,160 @@
+import base64
+import binascii
+import json
+import re
+
+from automation.logging.logger import get_logger
+
+logger = get_logger("ListingCapture")
+
+# Search / pagination responses of the results page (GraphQL and legacy REST).
+SEARCH_API_PATTERN = re.compile(r"/api/v\d+/(StaysSearch|ExploreSearch|explore_tabs)")
+# A full navigation to /s/... ships the first page of results inline.
+DEFERRED_STATE_READ = """
+() => Array.from(document.querySelectorAll('script[id^="data-deferred-state"]'))
+    .map(el => el.textContent)
+"""
+
+
+def is_search_response(response):
+    return bool(SEARCH_API_PATTERN.search(response.url))
+
+
+def _decode_id(value):
+    """'RGVtYW5kU3RheUxpc3Rpbmc6MTIz' → '123' (GraphQL global ids)."""
+    if not value:
+        return ""
+    try:
+        decoded = base64.b64decode(value, validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return str(value)
+    return decoded.rsplit(":", 1)[-1]
+
+
+def _iter_search_results(node):
+    """Yield every dict that looks like one search result, wherever it sits."""
+    if isinstance(node, dict):
+        has_listing = "listing" in node or "demandStayListing" in node
+        has_price = "structuredDisplayPrice" in node or "pricingQuote" in node
+        if has_listing and has_price:
+            yield node
+            return
+        for value in node.values():
+            yield from _iter_search_results(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_search_results(value)
+
+
+def _display_price(result):
+    structured = result.get("structuredDisplayPrice") or (
+        (result.get("pricingQuote") or {}).get("structuredStayDisplayPrice")
+    )
+    line = (structured or {}).get("primaryLine") or {}
+    price = line.get("discountedPrice") or line.get("price")
+    if price:
+        return price
+    rate = (result.get("pricingQuote") or {}).get("rate") or {}
+    return rate.get("amountFormatted", "")
+
+
+def _images(result, listing):
+    pictures = result.get("contextualPictures") or listing.get("contextualPictures")
+    urls = [p.get("picture") for p in pictures or [] if isinstance(p, dict)]
+    urls += listing.get("pictureUrls") or []
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+def parse_listings(payload):
+    """
+    Map a search response body to the record shape of
+    ResultPage.extract_properties ({title, price, images}) plus the
+    listing id. The price is the site's own formatted string, so any
+    currency comes through as displayed.
+    """
+    records = []
+    for result in _iter_search_results(payload):
+        listing = result.get("listing") or {}
+        demand = result.get("demandStayListing") or {}
+        localized = result.get("nameLocalized") or {}
+        title = (
+            result.get("title")
+            or listing.get("title")
+            or listing.get("name")
+            or localized.get("localizedStringWithTranslationPreference")
+            or ""
+        )
+        records.append(
+            {
+                "id": str(listing.get("id") or _decode_id(demand.get("id"))),
+                "title": title.strip(),
+                "price": _display_price(result),
+                "images": _images(result, listing),
+            }
+        )
+    return records
+
+
+class ListingCapture:
+    """
+    Collect listing records from the search API responses of a page.
+
+    Attach before the search is submitted; every StaysSearch response
+    (the submitted search and each pagination request) is kept and parsed
+    on demand, so the data is there as soon as the response arrives —
+    no waiting for the card grid to render or scrolling it into view.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self._responses = []
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        # Only filter here; reading the body is left to listings().
+        if is_search_response(response):
+            self._responses.append(response)
+
+    def detach(self):
+        self.page.remove_listener("response", self._on_response)
+
+    def listings(self):
+        """Records from every captured response, de-duplicated by id."""
+        records = {}
+        for response in self._responses:
+            try:
+                payload = response.json()
+            except Exception as e:
+                logger.warning(f"Unreadable search response {response.url}: {e}")
+                continue
+            for record in parse_listings(payload):
+                records.setdefault(record["id"] or len(records), record)
+        return list(records.values())
+
+    def _listings_from_document(self):
+        records = {}
+        for text in self.page.evaluate(DEFERRED_STATE_READ):
+            try:
+                payload = json.loads(text)
+            except (TypeError, ValueError):
+                continue
+            for record in parse_listings(payload):
+                records.setdefault(record["id"] or len(records), record)
+        return list(records.values())
+
+    def wait_for_listings(self, timeout=30000):
+        """
+        Captured listings. When the results page came from a full
+        navigation (resume, forked scenario) the first page is read from
+        the JSON inlined in the document; otherwise waits up to timeout
+        for the first search response.
+        """
+        records = self.listings() or self._listings_from_document()
+        if not records:
+            self.page.wait_for_event(
+                "response", predicate=is_search_response, timeout=timeout
+            )
+            records = self.listings()
+        if not records:
+            raise Exception("No listings found in search responses")
+        return records
@@ -0,0 +1,138 @@
+from automation.logging.logger import get_logger
+
+logger = get_logger("PerfMetrics")
+
+# Performance.getMetrics entries kept per step. Counters and durations are
+# reported as the delta over the step, heap and node counts as the value
+# at the end of it.
+CDP_DELTA_METRICS = (
+    "LayoutCount",
+    "RecalcStyleCount",
+    "LayoutDuration",
+    "RecalcStyleDuration",
+    "ScriptDuration",
+    "TaskDuration",
+)
+CDP_GAUGE_METRICS = ("JSHeapUsedSize", "JSHeapTotalSize", "Nodes", "Documents")
+
+PAGE_TIMING_READ = """
+() => {
+    const nav = performance.getEntriesByType("navigation")[0];
+    const round = (v) => Math.round(v * 10) / 10;
+    return {
+        time_origin: performance.timeOrigin,
+        navigation: nav ? {
+            url: nav.name,
+            type: nav.type,
+            dns_ms: round(nav.domainLookupEnd - nav.domainLookupStart),
+            connect_ms: round(nav.connectEnd - nav.connectStart),
+            ttfb_ms: round(nav.responseStart),
+            response_ms: round(nav.responseEnd - nav.responseStart),
+            dom_interactive_ms: round(nav.domInteractive),
+            dom_content_loaded_ms: round(nav.domContentLoadedEventEnd),
+            load_ms: round(nav.loadEventEnd),
+            transfer_bytes: nav.transferSize,
+        } : null,
+        paint: Object.fromEntries(
+            performance.getEntriesByType("paint")
+                .map(p => [p.name, round(p.startTime)])
+        ),
+    };
+}
+"""
+
+
+class StepMetricsCollector:
+    """
+    Opt-in page performance sampling around a workflow step.
+
+    begin() / end() bracket the step. The result separates what the page
+    spent (CDP Performance.getMetrics: script, task, layout time, heap)
+    from the wall-clock duration the driver measured, and for steps that
+    loaded a new document adds its Navigation and Paint timing entries.
+
+    Steps are sampled on the page they act on (begin(page=...), e.g. a
+    property tab), with one CDP session per page. Counters restart when a
+    navigation swaps the renderer process; such a step reports the counts
+    since the restart and "counters_reset": true instead of a negative delta.
+
+    CDP is Chromium-only; on other engines, or if the session cannot be
+    opened, only the Navigation / Paint timing part is collected.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self._sessions = {}
+        self._cdp_failed = False
+
+    def _session(self, page):
+        if self._cdp_failed:
+            return None
+        session = self._sessions.get(page)
+        if session is None:
+            # Drop sessions of tabs that have been closed since.
+            self._sessions = {p: s for p, s in self._sessions.items() if not p.is_closed()}
+            try:
+                session = page.context.new_cdp_session(page)
+                session.send("Performance.enable")
+            except Exception as e:
+                logger.info(f"CDP metrics unavailable: {e}")
+                self._cdp_failed = True
+                return None
+            self._sessions[page] = session
+        return session
+
+    def _cdp_metrics(self, page):
+        session = self._session(page)
+        if session is None:
+            return {}
+        try:
+            result = session.send("Performance.getMetrics")
+        except Exception as e:
+            logger.warning(f"Performance.getMetrics failed: {e}")
+            return {}
+        return {m["name"]: m["value"] for m in result.get("metrics", [])}
+
+    def _page_timing(self, page):
+        try:
+            return page.evaluate(PAGE_TIMING_READ)
+        except Exception:
+            # Page mid-navigation or closed; nothing to report.
+            return None
+
+    def begin(self, page=None):
+        page = page or self.page
+        timing = self._page_timing(page)
+        return {
+            "page": page,
+            "cdp": self._cdp_metrics(page),
+            "time_origin": timing["time_origin"] if timing else None,
+        }
+
+    def end(self, before):
+        page = before["page"]
+        after = self._cdp_metrics(page)
+        metrics = {}
+        if after:
+            for name in CDP_DELTA_METRICS:
+                if name in after:
+                    delta = after[name] - before["cdp"].get(name, 0)
+                    if delta < 0:
+                        # New renderer: its counters started from zero.
+                        delta = after[name]
+                        metrics["counters_reset"] = True
+                    # Durations come in seconds; store milliseconds.
+                    if name.endswith("Duration"):
+                        metrics[name] = round(delta * 1000, 1)
+                    else:
+                        metrics[name] = int(delta)
+            for name in CDP_GAUGE_METRICS:
+                if name in after:
+                    metrics[name] = int(after[name])
+
+        timing = self._page_timing(page)
+        # A changed timeOrigin means the step ended on a new document.
+        if timing and timing["time_origin"] != before["time_origin"]:
+            metrics["navigation"] = timing["navigation"]
+            metrics["paint"] = timing["paint"]
+        return metrics or None
@@ -1,4 +1,5 @@
 import os
+import shutil
 import uuid
 
 
@@ -11,3 +12,12 @@ class ScreenshotManager:
         path = os.path.join(cls.BASE_DIR, filename)
         page.screenshot(path=path)
         return path
+
+    @classmethod
+    def copy(cls, source, filename):
+        """Duplicate an existing screenshot (path with or without 'media/')."""
+        os.makedirs(cls.BASE_DIR, exist_ok=True)
+        src = os.path.join(cls.BASE_DIR, os.path.basename(source))
+        path = os.path.join(cls.BASE_DIR, filename)
+        shutil.copyfile(src, path)
+        return path
@@ -0,0 +1,151 @@
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+TEMPLATE_PATH = Path(__file__).resolve().parents[3] / "test.html"
+
+# Any carousel slide anchor — filled (with <picture>) or empty placeholder.
+SLIDE_PATTERN = re.compile(
+    r'<a aria-hidden="true"\s+tabindex="-1".*?</a>', re.DOTALL
+)
+IMAGE_URL_PATTERN = re.compile(
+    r"https://a0\.muscache\.com/im/pictures/miso/Hosting-\d+/original/[^\"\s?]+"
+)
+PRICE_ROW_PATTERN = re.compile(r'(data-testid="price-availability-row"[^>]*>)')
+
+TEMPLATE_LISTING_ID = "947832031919972335"
+TEMPLATE_TITLE = "Stylish Space with Character"
+
+
+class SyntheticResultsPage:
+    """
+    Build Airbnb-like results pages from the captured card in test.html.
+
+    test.html holds the listing cards container with a single card. The card
+    is cloned `cards` times, each clone gets its own listing id, title, price
+    and `images` carousel slides, so ResultPage.extract_properties sees the
+    same DOM shape it meets on the real site, just at an arbitrary scale.
+    """
+
+    def __init__(self, template_path=TEMPLATE_PATH):
+        lines = Path(template_path).read_text(encoding="utf-8").splitlines()
+
+        # Lines 1-3 open the container + row wrapper, the last two close them.
+        self.head = "\n".join(lines[:3])
+        self.tail = "\n".join(lines[-2:])
+        card = "\n".join(lines[3:-2])
+
+        slides = list(SLIDE_PATTERN.finditer(card))
+        if not slides:
+            raise ValueError(f"No carousel slides found in {template_path}")
+
+        filled = [m.group(0) for m in slides if "<picture" in m.group(0)]
+        self.slide = filled[0]
+
+        # Collapse the carousel into a single placeholder we can refill later.
+        self.card = (
+            card[: slides[0].start()] + "{slides}" + card[slides[-1].end() :]
+        )
+
+    # ------------------------------------------------------------------
+    # HTML generation
+    # ------------------------------------------------------------------
+
+    def _render_slides(self, listing_id, images):
+        slides = []
+        for n in range(images):
+            url = (
+                "https://a0.muscache.com/im/pictures/miso/"
+                f"Hosting-{listing_id}/original/synthetic-{n}.jpeg"
+            )
+            slides.append(IMAGE_URL_PATTERN.sub(url, self.slide))
+        return "".join(slides)
+
+    def render_card(self, index, images=5):
+        listing_id = str(10**17 + index)
+        html = self.card.replace(
+            "{slides}", self._render_slides(listing_id, images)
+        )
+        html = html.replace(TEMPLATE_LISTING_ID, listing_id)
+        html = html.replace(TEMPLATE_TITLE, f"Synthetic listing {index}")
+        price = f"${(index * 37) % 9000 + 40:,}"
+        return PRICE_ROW_PATTERN.sub(
+            rf"\1<span>{price} total</span>", html, count=1
+        )
+
+    def render(self, cards=10, images=5):
+        body = "\n".join(self.render_card(i, images) for i in range(cards))
+        return (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            f"<title>Synthetic results ({cards} cards)</title></head><body>"
+            f"{self.head}\n{body}\n{self.tail}"
+            "</body></html>"
+        )
+
+
+class SyntheticResultsServer:
+    """
+    Serve synthetic results pages on localhost from a background thread.
+
+        with SyntheticResultsServer() as server:
+            page.goto(server.url(cards=1000, images=8))
+
+    Rendered pages are cached per (cards, images) so repeated runs measure
+    the browser, not the generator.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, template_path=TEMPLATE_PATH):
+        self.generator = SyntheticResultsPage(template_path)
+        self.host = host
+        self.port = port
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def html(self, cards, images):
+        key = (cards, images)
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = self.generator.render(cards, images).encode(
+                    "utf-8"
+                )
+            return self._cache[key]
+
+    def url(self, cards=10, images=5):
+        return f"http://{self.host}:{self.port}/s/synthetic/homes?cards={cards}&images={images}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                cards = int(query.get("cards", ["10"])[0])
+                images = int(query.get("images", ["5"])[0])
+                body = server.html(cards, images)
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
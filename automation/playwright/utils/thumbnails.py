@@ -0,0 +1,65 @@
+import concurrent.futures
+import os
+
+from automation.logging.logger import get_logger
+
+logger = get_logger("Thumbnails")
+
+MEDIA_DIR = "media"
+THUMBNAIL_DIR = "automation/thumbnails"
+# Width of the thumbnail; full-page screenshots are cropped to the first
+# screen (THUMBNAIL_WIDTH × THUMBNAIL_HEIGHT) rather than squeezed.
+THUMBNAIL_WIDTH = 240
+THUMBNAIL_HEIGHT = 150
+THUMBNAIL_QUALITY = 60
+
+# One background thread: thumbnails are never on the workflow's hot path,
+# and pending ones are finished when the interpreter exits.
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="thumbnails"
+)
+
+
+def thumbnail_path(screenshot):
+    """Thumbnail path (relative to MEDIA_ROOT) for a screenshot path."""
+    stem = os.path.splitext(os.path.basename(screenshot))[0]
+    return f"{THUMBNAIL_DIR}/{stem}.webp"
+
+
+def _render(screenshot):
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    target = os.path.join(MEDIA_DIR, thumbnail_path(screenshot))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with Image.open(os.path.join(MEDIA_DIR, screenshot)) as image:
+        width, height = image.size
+        scale = THUMBNAIL_WIDTH / width
+        crop_height = min(height, int(THUMBNAIL_HEIGHT / scale))
+        thumb = image.crop((0, 0, width, crop_height)).convert("RGB")
+        thumb = thumb.resize(
+            (THUMBNAIL_WIDTH, max(1, int(crop_height * scale))),
+            Image.Resampling.BILINEAR,
+        )
+        # Write then rename so the admin never serves a half-written file.
+        partial = target + ".part"
+        thumb.save(partial, "WEBP", quality=THUMBNAIL_QUALITY, method=0)
+    os.replace(partial, target)
+    return target
+
+
+def _render_logged(screenshot):
+    try:
+        return _render(screenshot)
+    except Exception as e:
+        logger.warning(f"Thumbnail for {screenshot} failed: {e}")
+        return None
+
+
+def schedule_thumbnail(screenshot):
+    """Queue a WebP thumbnail of screenshot (relative to MEDIA_ROOT)."""
+    if screenshot:
+        return _executor.submit(_render_logged, screenshot)
+    return None
@@ -0,0 +1,97 @@
+import collections
+import os
+import shutil
+import tempfile
+
+from automation.logging.logger import get_logger
+
+logger = get_logger("TraceBuffer")
+
+
+class TraceRingBuffer:
+    """
+    Rolling Playwright trace of the last `size` steps of a context.
+
+    Tracing is started once per context; every step is recorded as its own
+    chunk (start_chunk / stop_chunk) into a temp directory and only the
+    newest `size` chunks are kept. persist() moves the buffered chunks out
+    as regular trace zips (open them with `playwright show-trace`), so a
+    later failure never saves the same chunk twice; discard() stops tracing
+    and drops everything, so a green run leaves nothing on disk.
+    """
+
+    def __init__(self, context, size):
+        self.context = context
+        self.size = size
+        self._dir = tempfile.mkdtemp(prefix="automation-trace-")
+        self._chunks = collections.deque()
+        self._counter = 0
+        self._recording = False
+        self._disabled = False
+        self._started = False
+
+    def _ensure_started(self):
+        try:
+            self.context.tracing.start(screenshots=True, snapshots=True)
+            self._started = True
+        except Exception as e:
+            # Another workflow on the same context (sweep tabs) started it.
+            if "already" not in str(e).lower():
+                raise
+
+    def begin(self, name):
+        if self._disabled:
+            return
+        try:
+            if self._counter == 0:
+                self._ensure_started()
+            self.context.tracing.start_chunk(title=name)
+            self._recording = True
+        except Exception as e:
+            logger.warning(f"Tracing disabled: {e}")
+            self._disabled = True
+
+    def end(self, name):
+        if not self._recording:
+            return
+        self._recording = False
+        self._counter += 1
+        safe = "".join(c if c.isalnum() or c in " -_" else "_" for c in name)
+        path = os.path.join(self._dir, f"{self._counter:03d} {safe[:80]}.zip")
+        try:
+            self.context.tracing.stop_chunk(path=path)
+        except Exception as e:
+            logger.warning(f"Failed to save trace chunk for {name}: {e}")
+            return
+        self._chunks.append(path)
+        while len(self._chunks) > self.size:
+            os.remove(self._chunks.popleft())
+
+    def persist(self, stem):
+        """
+        Move the buffered chunks out as trace zips: the newest (the failing
+        step) to `<stem>.trace.zip`, the ones before it to
+        `<stem>.trace-1.zip` (previous step), `-2`, ... Returns the newest
+        path, or "" when nothing was buffered.
+        """
+        if not self._chunks:
+            return ""
+        os.makedirs(os.path.dirname(stem) or ".", exist_ok=True)
+        newest = f"{stem}.trace.zip"
+        chunks = list(self._chunks)
+        self._chunks.clear()
+        for back, chunk in enumerate(reversed(chunks)):
+            target = newest if back == 0 else f"{stem}.trace-{back}.zip"
+            shutil.move(chunk, target)
+        return newest
+
+    def discard(self):
+        if self._started:
+            try:
+                self.context.tracing.stop()
+            except Exception:
+                # Context already closed; its trace went with it.
+                pass
+            self._started = False
+        self._chunks.clear()
+        shutil.rmtree(self._dir, ignore_errors=True)
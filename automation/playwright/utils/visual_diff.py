@@ -0,0 +1,177 @@
+import json
+import os
+import shutil
+import threading
+
+from automation.logging.logger import get_logger
+
+logger = get_logger("VisualBaseline")
+
+BASELINE_DIR = "media/automation/baselines"
+DIFF_DIR = "media/automation/diffs"
+# {"<step name>": [[x, y, width, height], ...]} — dynamic areas (prices,
+# carousels, dates) excluded from the diff.
+IGNORE_REGIONS_FILE = os.path.join(BASELINE_DIR, "ignore_regions.json")
+# dHash grid: HASH_SIZE × HASH_SIZE bits.
+HASH_SIZE = 16
+
+
+def _require_imaging():
+    """numpy and Pillow are optional; only visual baselines need them."""
+    try:
+        import numpy
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError(
+            "Visual baselines need numpy and Pillow (pip install numpy pillow)"
+        ) from e
+    return numpy, Image
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_visual_baseline():
+    """Process-wide VisualBaseline, or None without numpy / Pillow."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            try:
+                _shared = VisualBaseline()
+            except ImportError as e:
+                logger.warning(f"Visual baselines disabled: {e}")
+                _shared = False
+    return _shared or None
+
+
+def _safe_name(name):
+    return name.replace("/", "_")
+
+
+class VisualBaseline:
+    """
+    Compare step screenshots with a stored baseline per step name.
+
+    compare() first checks a HASH_SIZE² difference hash of both images (a
+    few microseconds once the baseline's hash is cached); when the hashes
+    are within hash_distance bits and the sizes match, the images are
+    treated as identical and the pixel diff is skipped. Otherwise a
+    vectorized diff marks every pixel whose largest channel difference
+    exceeds tolerance, ignore regions are masked out, and the score is the
+    changed fraction of the page (height differences count as changed).
+    A heatmap (dimmed page, changed pixels in red) is written to DIFF_DIR.
+
+    The first screenshot of a step becomes its baseline; delete the file
+    under BASELINE_DIR to re-baseline.
+    """
+
+    def __init__(self, tolerance=16, hash_distance=0, ignore_regions=None):
+        self.np, self.Image = _require_imaging()
+        self.tolerance = tolerance
+        self.hash_distance = hash_distance
+        self.ignore_regions = self._load_ignore_regions()
+        self.ignore_regions.update(ignore_regions or {})
+        # baseline path → (mtime, size, hash)
+        self._baselines = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load_ignore_regions():
+        try:
+            with open(IGNORE_REGIONS_FILE, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logger.warning(f"Ignoring malformed {IGNORE_REGIONS_FILE}: {e}")
+            return {}
+
+    def _open(self, path):
+        with self.Image.open(path) as image:
+            return image.convert("RGB")
+
+    def _dhash(self, image):
+        small = image.convert("L").resize(
+            (HASH_SIZE + 1, HASH_SIZE), self.Image.Resampling.BILINEAR
+        )
+        pixels = self.np.asarray(small)
+        return pixels[:, 1:] > pixels[:, :-1]
+
+    def _baseline_hash(self, path):
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._baselines.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+        image = self._open(path)
+        entry = (mtime, image.size, self._dhash(image))
+        with self._lock:
+            self._baselines[path] = entry
+        return entry[1], entry[2]
+
+    def _diff_mask(self, baseline, current, regions):
+        np = self.np
+        a = np.asarray(baseline)
+        b = np.asarray(current)
+        h, w = min(a.shape[0], b.shape[0]), min(a.shape[1], b.shape[1])
+
+        # Outside the common area everything counts as changed.
+        mask = np.ones(
+            (max(a.shape[0], b.shape[0]), max(a.shape[1], b.shape[1])), dtype=bool
+        )
+        a, b = a[:h, :w], b[:h, :w]
+        # |a - b| on uint8 without widening to a larger dtype.
+        delta = np.maximum(a, b) - np.minimum(a, b)
+        mask[:h, :w] = delta.max(axis=2) > self.tolerance
+
+        for x, y, width, height in regions:
+            mask[y : y + height, x : x + width] = False
+        return mask
+
+    def _write_heatmap(self, name, current, mask):
+        np = self.np
+        gray = np.asarray(current.convert("L"))
+        heat = np.zeros(mask.shape + (3,), dtype=np.uint8)
+        dimmed = (gray // 3).astype(np.uint8)
+        h, w = dimmed.shape
+        heat[:h, :w] = dimmed[:, :, None]
+        heat[mask] = (255, 0, 0)
+
+        os.makedirs(DIFF_DIR, exist_ok=True)
+        path = os.path.join(DIFF_DIR, _safe_name(name) + ".diff.png")
+        self.Image.fromarray(heat).save(path, compress_level=1)
+        return path
+
+    def compare(self, name, screenshot, create_baseline=True):
+        """
+        Diff screenshot (a file path) against the baseline of step `name`.
+
+        Returns {"score": 0..1, "heatmap": path or "", "skipped": bool}, or
+        None when there is no baseline yet. With create_baseline (PASS
+        screenshots only) that screenshot becomes the baseline.
+        """
+        baseline_path = os.path.join(BASELINE_DIR, _safe_name(name) + ".png")
+        if not os.path.exists(baseline_path):
+            if not create_baseline:
+                return None
+            os.makedirs(BASELINE_DIR, exist_ok=True)
+            shutil.copyfile(screenshot, baseline_path)
+            logger.info(f"New visual baseline: {baseline_path}")
+            return None
+
+        current = self._open(screenshot)
+        baseline_size, baseline_hash = self._baseline_hash(baseline_path)
+        if current.size == baseline_size:
+            distance = int(
+                self.np.count_nonzero(self._dhash(current) != baseline_hash)
+            )
+            if distance <= self.hash_distance:
+                return {"score": 0.0, "heatmap": "", "skipped": True}
+
+        mask = self._diff_mask(
+            self._open(baseline_path), current, self.ignore_regions.get(name, ())
+        )
+        score = float(mask.mean())
+        heatmap = self._write_heatmap(name, current, mask) if score else ""
+        return {"score": score, "heatmap": heatmap, "skipped": False}
@@ -0,0 +1,207 @@
+import itertools
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from automation.logging.logger import get_logger
+from automation.playwright.core.base_workflow import WorkflowCancelled
+from automation.playwright.pages.landing_page import LandingPage
+from automation.playwright.workflow.user_workflow import UserWorkflow
+from automation.service.step_events import broadcaster
+
+logger = get_logger("ScenarioSweep")
+
+URL_PARAM_KEYS = ("checkin", "checkout", "adults", "children", "infants", "pets")
+
+
+class ScenarioNode:
+    """
+    One node of the sweep tree.
+
+    The root stands for the shared prefix (landing page + popups), its
+    children are countries (one search-form pass each) and their children
+    are the leaf scenarios (dates × guests) reached from that search.
+    """
+
+    def __init__(self, label, params=None):
+        self.label = label
+        self.params = params or {}
+        self.children = []
+
+    def leaves(self):
+        if not self.children:
+            return [self]
+        return [leaf for child in self.children for leaf in child.leaves()]
+
+
+def build_scenario_tree(countries, dates=None, guests=None):
+    """
+    countries: ["Japan", ...]
+    dates:     [("2026-12-01", "2026-12-05"), ...]  (optional)
+    guests:    [{"adults": 2, "children": 0, ...}, ...]  (optional)
+    """
+    root = ScenarioNode("prefix")
+    for country in countries:
+        country_node = ScenarioNode(country, {"country": country})
+        combinations = itertools.product(dates or [None], guests or [None])
+        for date_pair, guest_counts in combinations:
+            params = {"country": country}
+            label = [country]
+            if date_pair:
+                params["checkin"], params["checkout"] = date_pair
+                label.append(f"{date_pair[0]}→{date_pair[1]}")
+            if guest_counts:
+                params.update(guest_counts)
+                label.append(
+                    " ".join(f"{v}{k[0].upper()}" for k, v in guest_counts.items())
+                )
+            country_node.children.append(ScenarioNode(" ".join(label), params))
+        root.children.append(country_node)
+    return root
+
+
+def rewrite_search_url(url, params):
+    """Swap the dates / guest counts of a results URL for another leaf's."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    for key in URL_PARAM_KEYS:
+        if key in params:
+            query[key] = str(params[key])
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class ScenarioSweep:
+    """
+    Cover a countries × dates × guests matrix while sharing common work.
+
+      prefix   landing page + popups run once on the landing tab, which
+               every branch then reuses: it keeps the consent cookies, the
+               renderer and the site's assets already in memory.
+      country  one pass through the search form (steps 4–18), using the
+               first leaf's dates and guests; later countries first
+               navigate the tab back to the landing URL.
+      leaf     the first leaf continues from the country's search; every
+               other leaf navigates the tab straight to the country's
+               results URL with its own dates/guests swapped into the query
+               string, so it skips the search form entirely.
+
+    Every scenario writes its steps under a "[label] " prefix; failures are
+    isolated to the branch they happen in. After each branch the tabs it
+    opened (property pages) are closed and its "end" event is published.
+    """
+
+    def __init__(self, page, tree, stop_event=None):
+        self.page = page
+        self.tree = tree
+        self.stop_event = stop_event
+        self.workflows = []
+        self.results = []
+
+    def _workflow(self, page, label, params=None):
+        workflow = UserWorkflow(
+            page,
+            params=params,
+            stop_event=self.stop_event,
+            step_prefix=f"[{label}] ",
+        )
+        self.workflows.append(workflow)
+        return workflow
+
+    def _record(self, leaf, workflow, status, error=None):
+        self.results.append(
+            {
+                "scenario": leaf.label,
+                "params": leaf.params,
+                "run_id": workflow.run_id if workflow else None,
+                "status": status,
+                "error": error,
+            }
+        )
+
+    def _close_other_tabs(self):
+        """Close the property tabs a branch opened; only the shared tab stays."""
+        for page in list(self.page.context.pages):
+            if page is not self.page:
+                try:
+                    page.close()
+                except Exception:
+                    pass
+
+    def _run_branch(self, fn, leaf, workflow):
+        status = "FAIL"
+        try:
+            fn()
+            workflow.clear_checkpoints()
+            status = "PASS"
+            self._record(leaf, workflow, status)
+            return True
+        except WorkflowCancelled as e:
+            status = "CANCELLED"
+            self._record(leaf, workflow, status, str(e))
+        except Exception as e:
+            workflow.log_error(e)
+            self._record(leaf, workflow, status, str(e))
+        finally:
+            workflow.discard_traces()
+            self._close_other_tabs()
+            broadcaster.publish(workflow.run_id, "end", status=status)
+        return False
+
+    def run(self):
+        tab = self.page
+
+        # ── Shared prefix ─────────────────────────────────────────────────
+        prefix = self._workflow(tab, "sweep")
+        try:
+            prefix._open_landing()
+        except Exception as e:
+            prefix.log_error(e)
+            broadcaster.publish(prefix.run_id, "end", status="FAIL")
+            for leaf in self.tree.leaves():
+                self._record(leaf, None, "FAIL", f"Shared prefix failed: {e}")
+            return self.results
+        finally:
+            prefix.discard_traces()
+        broadcaster.publish(prefix.run_id, "end", status="PASS")
+        landing_url = tab.url
+
+        for i, country in enumerate(self.tree.children):
+            first, *rest = country.children
+
+            # ── Country branch: one search-form pass ──────────────────────
+            workflow = self._workflow(tab, first.label, first.params)
+            search = {}
+
+            def search_and_explore():
+                if i > 0:
+                    workflow.run_step(
+                        "Return to Airbnb landing page (shared tab)",
+                        LandingPage(tab).open,
+                        landing_url,
+                    )
+                search.update(workflow._search_from_landing())
+                workflow._explore_results(search)
+
+            self._run_branch(search_and_explore, first, workflow)
+
+            if not search.get("url"):
+                for leaf in rest:
+                    error = f"Search for {country.label} failed"
+                    self._record(leaf, None, "FAIL", error)
+                continue
+
+            # ── Leaves: jump to the country's rewritten results URL ───────
+            for leaf in rest:
+                leaf_workflow = self._workflow(tab, leaf.label, leaf.params)
+                url = rewrite_search_url(search["url"], leaf.params)
+                leaf_search = {**search, **leaf.params, "url": url}
+
+                def open_and_explore():
+                    leaf_workflow.run_step(
+                        "Open search results (forked from shared search)",
+                        LandingPage(tab).open,
+                        url,
+                    )
+                    leaf_workflow._explore_results(leaf_search)
+
+                self._run_branch(open_and_explore, leaf, leaf_workflow)
+
+        return self.results
@@ -0,0 +1,169 @@
+import queue
+import random
+import signal
+import threading
+
+from django.db import close_old_connections
+
+from automation.logging.logger import get_logger
+
+logger = get_logger("AutomationDaemon")
+
+
+class AutomationDaemon:
+    """
+    Keep Python, Django and Chromium warm and run UserWorkflow on a schedule.
+
+    One worker thread per concurrency slot, each owning its own Playwright
+    driver and browser (the sync API is not shareable across threads). Every
+    run gets a fresh browser context, so runs stay isolated while the browser
+    process is reused. The scheduler (main thread) fires every `interval`
+    seconds ± `jitter` and skips a tick when all slots are busy instead of
+    building a backlog.
+
+    SIGTERM / SIGINT set the stop event: no new runs are scheduled, running
+    workflows finish their current step, flush their results and the
+    browsers are closed.
+    """
+
+    def __init__(
+        self,
+        interval=300,
+        jitter=30,
+        max_concurrent=1,
+        max_runs=None,
+        headless=True,
+        context_template=None,
+        skip_clear=False,
+        params=None,
+        resource_limits=None,
+        launch_profile=None,
+        http_cache=None,
+    ):
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrent = max_concurrent
+        self.max_runs = max_runs
+        self.headless = headless
+        self.context_template = context_template
+        self.skip_clear = skip_clear
+        self.params = params
+        self.resource_limits = resource_limits
+        self.launch_profile = launch_profile
+        self.http_cache = http_cache
+
+        self.stop_event = threading.Event()
+        self._tickets = queue.Queue()
+        self._busy = threading.Semaphore(max_concurrent)
+        self._workers = []
+        self.runs_started = 0
+        self.results = {"PASS": 0, "FAIL": 0, "CANCELLED": 0}
+        self._results_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Signals
+    # ------------------------------------------------------------------
+
+    def install_signal_handlers(self):
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self._handle_signal)
+
+    def _handle_signal(self, signum, frame):
+        logger.info(f"Received signal {signum}, stopping after in-flight steps")
+        self.stop_event.set()
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _worker(self, slot):
+        from automation.playwright.core.browser_manager import BrowserManager
+        from automation.service.workflow_runner import WorkFlowRunner
+
+        try:
+            browser = BrowserManager(
+                headless=self.headless,
+                context_template=self.context_template,
+                resource_limits=self.resource_limits,
+                launch_profile=self.launch_profile,
+                http_cache=self.http_cache,
+            ).start()
+        except Exception as e:
+            logger.error(f"Worker {slot} failed to launch browser: {e}")
+            self.stop_event.set()
+            return
+        runner = WorkFlowRunner()
+        logger.info(f"Worker {slot} ready (browser warm)")
+
+        try:
+            while True:
+                ticket = self._tickets.get()
+                if ticket is None:
+                    break
+                try:
+                    page = browser.new_page()
+                    result = runner.run_on_page(
+                        page,
+                        params=self.params,
+                        stop_event=self.stop_event,
+                        # After new_page(): the template file exists by now.
+                        clear_browser_data=not (
+                            self.skip_clear and browser.template_is_clean
+                        ),
+                    )
+                    with self._results_lock:
+                        self.results[result["status"]] = (
+                            self.results.get(result["status"], 0) + 1
+                        )
+                    logger.info(
+                        f"Worker {slot} run {ticket} finished: {result['status']}"
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Worker {slot} run {ticket} crashed: {e}", exc_info=True
+                    )
+                finally:
+                    close_old_connections()
+                    self._busy.release()
+                    browser.end_run()
+        finally:
+            browser.stop()
+            close_old_connections()
+            logger.info(f"Worker {slot} stopped")
+
+    # ------------------------------------------------------------------
+    # Scheduler loop
+    # ------------------------------------------------------------------
+
+    def _next_delay(self):
+        return max(0.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    def serve_forever(self):
+        for slot in range(self.max_concurrent):
+            worker = threading.Thread(
+                target=self._worker, args=(slot,), name=f"automation-worker-{slot}"
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        try:
+            while not self.stop_event.is_set():
+                if self.max_runs is not None and self.runs_started >= self.max_runs:
+                    break
+
+                if self._busy.acquire(blocking=False):
+                    self.runs_started += 1
+                    self._tickets.put(self.runs_started)
+                else:
+                    logger.warning("All run slots busy, skipping this tick")
+
+                self.stop_event.wait(self._next_delay())
+        finally:
+            # Let queued tickets drain, then release each worker.
+            for _ in self._workers:
+                self._tickets.put(None)
+            for worker in self._workers:
+                worker.join()
+
+        logger.info(f"Daemon stopped after {self.runs_started} runs: {self.results}")
+        return self.results
@@ -0,0 +1,124 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from automation.models import Result
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = (
+    "id",
+    "test_case",
+    "passed",
+    "comment",
+    "url",
+    "created_at",
+    "updated_at",
+)
+EXPORT_FORMATS = ("csv", "ndjson")
+
+
+class ExportError(ValueError):
+    pass
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _parse_moment(value, end_of_day=False):
+    # A plain date is checked first: on Python 3.11+ parse_datetime accepts
+    # it too and returns midnight, which would drop the rest of an `until`
+    # day. Both parsers return None for malformed input but raise ValueError
+    # for well-formed impossible values such as 2026-02-30.
+    try:
+        day = parse_date(value)
+        moment = parse_datetime(value) if day is None else None
+    except ValueError:
+        raise ExportError(f"Invalid date: {value!r}") from None
+    if day is not None:
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    elif moment is None:
+        raise ExportError(f"Invalid date: {value!r}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_results(since=None, until=None, status=None, step=None):
+    """
+    Build the export queryset.
+
+    since / until: ISO date or datetime (until is inclusive for plain dates).
+    status: "pass" or "fail". step: substring of the test case name.
+    """
+    qs = Result.objects.order_by("id")
+    if since:
+        qs = qs.filter(created_at__gte=_parse_moment(since))
+    if until:
+        qs = qs.filter(created_at__lte=_parse_moment(until, end_of_day=True))
+    if status:
+        if status not in ("pass", "fail"):
+            raise ExportError("status must be 'pass' or 'fail'")
+        qs = qs.filter(passed=status == "pass")
+    if step:
+        qs = qs.filter(test_case__icontains=step)
+    return qs
+
+
+def _rows(qs):
+    # values_list + iterator: no model instances, no result cache, and the
+    # database cursor is read EXPORT_CHUNK_SIZE rows at a time.
+    return qs.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _arows(qs):
+    # Same for async consumers: each chunk is fetched in a worker thread.
+    return qs.values_list(*EXPORT_FIELDS).aiterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _formatter(fmt):
+    """(header line or None, row -> line) for one export format."""
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        return writer.writerow(EXPORT_FIELDS), lambda row: writer.writerow(
+            [v.isoformat() if isinstance(v, datetime) else v for v in row]
+        )
+    if fmt == "ndjson":
+        return None, lambda row: json.dumps(
+            dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False, default=str
+        ) + "\n"
+    raise ExportError(f"Unsupported format: {fmt!r}")
+
+
+def iter_export(qs, fmt):
+    header, line = _formatter(fmt)
+
+    def lines():
+        if header is not None:
+            yield header
+        for row in _rows(qs):
+            yield line(row)
+
+    return lines()
+
+
+def aiter_export(qs, fmt):
+    """
+    Async twin of iter_export for ASGI, where a sync iterator would be
+    collected into a list before the first byte is sent.
+    """
+    header, line = _formatter(fmt)
+
+    async def lines():
+        if header is not None:
+            yield header
+        async for row in _arows(qs):
+            yield line(row)
+
+    return lines()
@@ -0,0 +1,315 @@
+import os
+import signal
+import socket
+import threading
+from datetime import date, timedelta
+
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from automation.logging.logger import get_logger
+from automation.models import WorkflowCheckpoint, WorkflowJob
+
+logger = get_logger("JobWorker")
+
+JOB_PARAM_KEYS = (
+    "country",
+    "checkin",
+    "checkout",
+    "adults",
+    "children",
+    "infants",
+    "pets",
+    "listing_source",
+)
+LISTING_SOURCES = ("dom", "network")
+DEFAULT_LEASE_SECONDS = 300
+CLAIM_BATCH = 5
+
+
+class JobError(ValueError):
+    pass
+
+
+# ----------------------------------------------------------------------
+# Enqueue API
+# ----------------------------------------------------------------------
+
+
+def validate_params(params):
+    unknown = set(params) - set(JOB_PARAM_KEYS)
+    if unknown:
+        raise JobError(f"Unknown job parameters: {sorted(unknown)}")
+
+    if bool(params.get("checkin")) != bool(params.get("checkout")):
+        raise JobError("checkin and checkout must be given together")
+    if params.get("checkin"):
+        try:
+            checkin = date.fromisoformat(params["checkin"])
+            checkout = date.fromisoformat(params["checkout"])
+        except ValueError as e:
+            raise JobError(f"Invalid date: {e}")
+        if checkin >= checkout:
+            raise JobError("checkout must be after checkin")
+
+    for key in ("adults", "children", "infants", "pets"):
+        if key in params and (not isinstance(params[key], int) or params[key] < 0):
+            raise JobError(f"{key} must be a non-negative integer")
+    if params.get("listing_source", "dom") not in LISTING_SOURCES:
+        raise JobError(f"listing_source must be one of {LISTING_SOURCES}")
+    return params
+
+
+def enqueue_job(params=None, max_attempts=3):
+    """Queue one UserWorkflow run with the given parameters."""
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    validate_params(params)
+    job = WorkflowJob.objects.create(params=params, max_attempts=max_attempts)
+    logger.info(f"Enqueued job #{job.pk}: {params}")
+    return job
+
+
+# ----------------------------------------------------------------------
+# Claiming / leasing (compare-and-set UPDATEs, safe across hosts)
+# ----------------------------------------------------------------------
+
+
+def _checkpoint_key(job_id):
+    return f"job-{job_id}"
+
+
+def requeue_expired_jobs():
+    """Return jobs whose lease ran out to the queue, or fail them for good."""
+    now = timezone.now()
+    expired = WorkflowJob.objects.filter(
+        status=WorkflowJob.RUNNING, lease_expires_at__lt=now
+    )
+    final = expired.filter(attempts__gte=F("max_attempts"))
+    WorkflowCheckpoint.objects.filter(
+        key__in=[_checkpoint_key(pk) for pk in final.values_list("id", flat=True)]
+    ).delete()
+    failed = final.update(
+        status=WorkflowJob.FAILED,
+        error="Lease expired on final attempt",
+        finished_at=now,
+    )
+    requeued = expired.filter(attempts__lt=F("max_attempts")).update(
+        status=WorkflowJob.PENDING, worker_id="", lease_expires_at=None
+    )
+    if failed or requeued:
+        logger.warning(f"Lease expiry: {requeued} job(s) re-queued, {failed} failed")
+    return requeued
+
+
+def claim_job(worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    Atomically claim the oldest pending job, or return None.
+
+    Each candidate is taken with UPDATE ... WHERE id = x AND status =
+    'pending'; only one worker's update can match, on any backend.
+    """
+    candidates = WorkflowJob.objects.filter(
+        status=WorkflowJob.PENDING
+    ).values_list("id", flat=True)[:CLAIM_BATCH]
+
+    for job_id in list(candidates):
+        now = timezone.now()
+        claimed = WorkflowJob.objects.filter(
+            id=job_id, status=WorkflowJob.PENDING
+        ).update(
+            status=WorkflowJob.RUNNING,
+            worker_id=worker_id,
+            attempts=F("attempts") + 1,
+            started_at=now,
+            heartbeat_at=now,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+        )
+        if claimed:
+            return WorkflowJob.objects.get(id=job_id)
+    return None
+
+
+def heartbeat(job_id, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """Extend the lease; False means the job is no longer ours."""
+    now = timezone.now()
+    return bool(
+        WorkflowJob.objects.filter(
+            id=job_id, worker_id=worker_id, status=WorkflowJob.RUNNING
+        ).update(
+            heartbeat_at=now, lease_expires_at=now + timedelta(seconds=lease_seconds)
+        )
+    )
+
+
+def _finish(job, owner, **fields):
+    """Update the job, only if `owner` still holds it (fields may clear worker_id)."""
+    return WorkflowJob.objects.filter(
+        id=job.pk, worker_id=owner, status=WorkflowJob.RUNNING
+    ).update(finished_at=timezone.now(), lease_expires_at=None, **fields)
+
+
+def _finish_attempt(job, owner, **fields):
+    """
+    End a failed attempt: back to the queue while attempts remain (the
+    retry resumes from the job's checkpoint), else FAILED for good and the
+    checkpoint, which holds the run's cookies, is deleted.
+    """
+    if job.attempts < job.max_attempts:
+        return _finish(job, owner, status=WorkflowJob.PENDING, worker_id="", **fields)
+    WorkflowCheckpoint.objects.filter(key=_checkpoint_key(job.pk)).delete()
+    return _finish(job, owner, status=WorkflowJob.FAILED, **fields)
+
+
+# ----------------------------------------------------------------------
+# Worker process
+# ----------------------------------------------------------------------
+
+
+class JobWorker:
+    """
+    Claim and execute WorkflowJobs until stopped.
+
+    Keeps one warm browser and opens a fresh context per job. A background
+    thread heartbeats the lease while the workflow runs. Start as many
+    workers as you like, on as many hosts as share the database.
+    """
+
+    def __init__(
+        self,
+        lease_seconds=DEFAULT_LEASE_SECONDS,
+        poll_interval=5,
+        max_jobs=None,
+        headless=True,
+        context_template=None,
+        skip_clear=False,
+        resource_limits=None,
+        launch_profile=None,
+        http_cache=None,
+    ):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_jobs = max_jobs
+        self.headless = headless
+        self.context_template = context_template
+        self.skip_clear = skip_clear
+        self.resource_limits = resource_limits
+        self.launch_profile = launch_profile
+        self.http_cache = http_cache
+        self.stop_event = threading.Event()
+        self.jobs_done = 0
+
+    def install_signal_handlers(self):
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self._handle_signal)
+
+    def _handle_signal(self, signum, frame):
+        logger.info(f"Received signal {signum}, stopping after in-flight steps")
+        self.stop_event.set()
+
+    def _heartbeat_loop(self, job, done):
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                if not heartbeat(job.pk, self.worker_id, self.lease_seconds):
+                    logger.warning(f"Lost lease on job #{job.pk}")
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat for job #{job.pk} failed: {e}")
+            finally:
+                close_old_connections()
+
+    def _execute(self, browser, runner, job):
+        try:
+            self._run_job(browser, runner, job)
+        finally:
+            # Only once the job is finished: a browser that cannot be
+            # restarted stops the worker, but never strands a RUNNING job.
+            browser.end_run()
+
+    def _run_job(self, browser, runner, job):
+        done = threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat_loop, args=(job, done), daemon=True
+        )
+        beat.start()
+
+        try:
+            page = browser.new_page()
+            # Retries of the same job resume from its last checkpoint.
+            result = runner.run_on_page(
+                page,
+                params=job.params,
+                stop_event=self.stop_event,
+                checkpoint_key=_checkpoint_key(job.pk),
+                clear_browser_data=not (
+                    self.skip_clear and browser.template_is_clean
+                ),
+            )
+        except Exception as e:
+            logger.error(f"Job #{job.pk} crashed: {e}", exc_info=True)
+            _finish_attempt(job, self.worker_id, error=str(e))
+            return
+        finally:
+            done.set()
+            beat.join()
+
+        if result["status"] == "CANCELLED":
+            # Shutdown interrupted the run: hand the job back untouched.
+            _finish(
+                job,
+                self.worker_id,
+                status=WorkflowJob.PENDING,
+                attempts=F("attempts") - 1,
+                worker_id="",
+            )
+            logger.info(f"Job #{job.pk} released back to the queue")
+            return
+
+        fields = {
+            "result": result,
+            "run_id": result.get("run_id", ""),
+            "error": result.get("error") or "",
+        }
+        if result["status"] == "PASS":
+            _finish(job, self.worker_id, status=WorkflowJob.SUCCEEDED, **fields)
+        else:
+            _finish_attempt(job, self.worker_id, **fields)
+        logger.info(f"Job #{job.pk} finished: {result['status']}")
+
+    def serve_forever(self):
+        logger.info(f"Worker {self.worker_id} starting")
+        # Only workers need the browser stack; enqueueing stays lightweight.
+        from automation.playwright.core.browser_manager import BrowserManager
+        from automation.service.workflow_runner import WorkFlowRunner
+
+        browser = BrowserManager(
+            headless=self.headless,
+            context_template=self.context_template,
+            resource_limits=self.resource_limits,
+            launch_profile=self.launch_profile,
+            http_cache=self.http_cache,
+        ).start()
+        runner = WorkFlowRunner()
+
+        try:
+            while not self.stop_event.is_set():
+                if self.max_jobs is not None and self.jobs_done >= self.max_jobs:
+                    break
+
+                requeue_expired_jobs()
+                job = claim_job(self.worker_id, self.lease_seconds)
+                if job is None:
+                    close_old_connections()
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+
+                logger.info(f"Claimed job #{job.pk} (attempt {job.attempts})")
+                self._execute(browser, runner, job)
+                self.jobs_done += 1
+                close_old_connections()
+        finally:
+            browser.stop()
+
+        logger.info(f"Worker {self.worker_id} stopped after {self.jobs_done} jobs")
+        return self.jobs_done
@@ -0,0 +1,175 @@
+import base64
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from automation.models import Result, StepRun, WorkflowRun
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Per resource: every selectable field, the ones returned without
+# ?fields= (large text / JSON columns are only sent when asked for), and
+# the query params it can be filtered on.
+RESOURCES = {
+    "steps": {
+        "model": Result,
+        "fields": (
+            "id",
+            "test_case",
+            "passed",
+            "comment",
+            "url",
+            "screenshot",
+            "visual_diff_score",
+            "visual_diff_heatmap",
+            "created_at",
+            "updated_at",
+        ),
+        "default": ("id", "test_case", "passed", "url", "created_at", "updated_at"),
+        "modified": "updated_at",
+        "filters": ("status", "step"),
+    },
+    "runs": {
+        "model": WorkflowRun,
+        "fields": (
+            "id",
+            "run_id",
+            "status",
+            "steps",
+            "failures",
+            "duration_ms",
+            "started_at",
+            "finished_at",
+            "created_at",
+        ),
+        "default": (
+            "id",
+            "run_id",
+            "status",
+            "steps",
+            "failures",
+            "duration_ms",
+            "started_at",
+            "finished_at",
+            "created_at",
+        ),
+        "modified": "created_at",
+        "filters": ("status",),
+    },
+    "step-runs": {
+        "model": StepRun,
+        "fields": (
+            "id",
+            "run_id",
+            "test_case",
+            "passed",
+            "duration_ms",
+            "metrics",
+            "created_at",
+        ),
+        "default": ("id", "run_id", "test_case", "passed", "duration_ms", "created_at"),
+        "modified": "created_at",
+        "filters": ("status", "step", "run_id"),
+    },
+}
+
+
+class ApiError(ValueError):
+    pass
+
+
+def encode_cursor(created_at, pk):
+    raw = json.dumps([created_at.isoformat(), pk]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, pk = json.loads(raw)
+        moment = parse_datetime(created_at)
+    except (ValueError, TypeError):
+        moment = None
+    if moment is None or not isinstance(pk, int):
+        raise ApiError("Invalid cursor")
+    return moment, pk
+
+
+def build_filters(resource, params):
+    """ORM filters from the query params the resource supports."""
+    spec = RESOURCES[resource]
+    filters = {}
+    status = params.get("status") if "status" in spec["filters"] else None
+    if status:
+        if status not in ("pass", "fail"):
+            raise ApiError("status must be 'pass' or 'fail'")
+        if spec["model"] is WorkflowRun:
+            filters["status"] = WorkflowRun.PASS if status == "pass" else WorkflowRun.FAIL
+        else:
+            filters["passed"] = status == "pass"
+    if "step" in spec["filters"] and params.get("step"):
+        filters["test_case"] = params["step"]
+    if "run_id" in spec["filters"] and params.get("run_id"):
+        filters["run_id"] = params["run_id"]
+    return filters
+
+
+def select_fields(resource, fields=None):
+    """Requested fields in declaration order; id and created_at always ride along."""
+    spec = RESOURCES[resource]
+    if not fields:
+        return spec["default"]
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(spec["fields"])
+    if unknown:
+        raise ApiError(
+            f"Unknown field(s) {sorted(unknown)}, expected any of {list(spec['fields'])}"
+        )
+    requested |= {"id", "created_at"}
+    return tuple(f for f in spec["fields"] if f in requested)
+
+
+def fetch_page(resource, fields, cursor=None, limit=DEFAULT_PAGE_SIZE, **filters):
+    """
+    One page of rows, newest first, plus the cursor of the next page.
+
+    Keyset pagination on (created_at, id): the next page starts strictly
+    after the last row seen, so every page is an index range scan of
+    `limit` rows however deep the client has paged.
+    """
+    spec = RESOURCES[resource]
+    qs = spec["model"].objects.filter(**filters).order_by("-created_at", "-id")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        qs = qs.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    columns = fields
+    if spec["modified"] not in columns:
+        columns = (*columns, spec["modified"])
+    rows = list(qs.values(*columns)[: limit + 1])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    last_modified = max((row[spec["modified"]] for row in rows), default=None)
+    if spec["modified"] not in fields:
+        for row in rows:
+            del row[spec["modified"]]
+    return rows, next_cursor, last_modified
+
+
+def page_etag(body):
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+
+def render_page(rows, next_cursor):
+    return json.dumps(
+        {"results": rows, "next_cursor": next_cursor}, cls=DjangoJSONEncoder
+    )
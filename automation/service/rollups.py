@@ -0,0 +1,184 @@
+from collections import defaultdict
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from automation.logging.logger import get_logger
+from automation.models import StepRollup, StepRun, WorkflowRun
+
+logger = get_logger("Rollups")
+
+# Upper bounds (inclusive) of the duration histogram buckets; the last
+# bucket of every histogram counts everything slower than the final bound.
+DURATION_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+GRANULARITIES = (StepRollup.HOUR, StepRollup.DAY)
+REBUILD_CHUNK_SIZE = 2000
+
+
+def bucket_index(duration_ms):
+    for i, bound in enumerate(DURATION_BUCKETS_MS):
+        if duration_ms <= bound:
+            return i
+    return len(DURATION_BUCKETS_MS)
+
+
+def empty_histogram():
+    return [0] * (len(DURATION_BUCKETS_MS) + 1)
+
+
+def period_start(moment, granularity):
+    """Truncate to the local hour / day the rollup row is keyed on."""
+    local = timezone.localtime(moment)
+    local = local.replace(minute=0, second=0, microsecond=0)
+    if granularity == StepRollup.DAY:
+        local = local.replace(hour=0)
+    return local
+
+
+def _aggregate(outcomes):
+    """Fold (test_case, passed, duration_ms, created_at) tuples into deltas."""
+    deltas = defaultdict(
+        lambda: {
+            "total": 0,
+            "failures": 0,
+            "duration_sum_ms": 0.0,
+            "duration_histogram": empty_histogram(),
+        }
+    )
+    for test_case, passed, duration_ms, created_at in outcomes:
+        for granularity in GRANULARITIES:
+            key = (test_case, granularity, period_start(created_at, granularity))
+            delta = deltas[key]
+            delta["total"] += 1
+            delta["failures"] += 0 if passed else 1
+            delta["duration_sum_ms"] += duration_ms
+            delta["duration_histogram"][bucket_index(duration_ms)] += 1
+    return deltas
+
+
+def summarize_run(runs, status=None):
+    """WorkflowRun fields for one run's StepRun rows (status derived if None)."""
+    failures = sum(1 for r in runs if not r.passed)
+    started = min(r.created_at - timedelta(milliseconds=r.duration_ms) for r in runs)
+    finished = max(r.created_at for r in runs)
+    return {
+        "status": status or (WorkflowRun.FAIL if failures else WorkflowRun.PASS),
+        "steps": len(runs),
+        "failures": failures,
+        "duration_ms": sum(r.duration_ms for r in runs),
+        "started_at": started,
+        "finished_at": finished,
+        "created_at": finished,
+    }
+
+
+def _apply_delta(test_case, granularity, start, delta):
+    """
+    Add one run's delta to a rollup row, creating it if needed.
+
+    The counters are incremented with F() in a single UPDATE, which takes
+    the row's write lock (the whole database's on SQLite) until the
+    transaction commits; the histogram is read and written back under that
+    lock, so concurrent runs cannot lose each other's counts.
+    """
+    rows = StepRollup.objects.filter(
+        test_case=test_case, granularity=granularity, period_start=start
+    )
+    increments = {
+        "total": F("total") + delta["total"],
+        "failures": F("failures") + delta["failures"],
+        "duration_sum_ms": F("duration_sum_ms") + delta["duration_sum_ms"],
+    }
+    if not rows.update(**increments):
+        try:
+            with transaction.atomic():
+                StepRollup.objects.create(
+                    test_case=test_case,
+                    granularity=granularity,
+                    period_start=start,
+                    **delta,
+                )
+            return
+        except IntegrityError:
+            # Another run created the row in the meantime.
+            rows.update(**increments)
+
+    histogram = rows.values_list("duration_histogram", flat=True).get()
+    rows.update(
+        duration_histogram=[
+            a + b
+            for a, b in zip(histogram or empty_histogram(), delta["duration_histogram"])
+        ]
+    )
+
+
+def record_run(step_outcomes, status=None):
+    """
+    Persist a finished workflow's steps and fold them into the rollups.
+
+    step_outcomes is BaseWorkflow.step_outcomes; status is the workflow's
+    result status (derived from the steps when omitted). Everything happens
+    in one transaction: the StepRun history rows are bulk inserted, the
+    WorkflowRun summary is written and only the rollup rows this run touches
+    are updated in place, so the cost depends on the size of the run, never
+    on the size of the history.
+    """
+    if not step_outcomes:
+        return
+
+    runs = [
+        StepRun(
+            run_id=o["run_id"],
+            test_case=o["test_case"],
+            passed=o["passed"],
+            duration_ms=o["duration_ms"],
+            metrics=o.get("metrics"),
+            created_at=o["finished_at"],
+        )
+        for o in step_outcomes
+    ]
+    deltas = _aggregate(
+        (r.test_case, r.passed, r.duration_ms, r.created_at) for r in runs
+    )
+
+    with transaction.atomic():
+        StepRun.objects.bulk_create(runs)
+        WorkflowRun.objects.update_or_create(
+            run_id=runs[0].run_id, defaults=summarize_run(runs, status)
+        )
+
+        for (test_case, granularity, start), delta in deltas.items():
+            _apply_delta(test_case, granularity, start, delta)
+
+    logger.info(f"Rollups updated: {len(runs)} steps, {len(deltas)} rollup rows")
+
+
+def rebuild_rollups():
+    """Recompute every rollup row from the StepRun history."""
+    rows = (
+        StepRun.objects.order_by()
+        .values_list("test_case", "passed", "duration_ms", "created_at")
+        .iterator(chunk_size=REBUILD_CHUNK_SIZE)
+    )
+    deltas = _aggregate(rows)
+
+    with transaction.atomic():
+        StepRollup.objects.all().delete()
+        StepRollup.objects.bulk_create(
+            [
+                StepRollup(
+                    test_case=test_case,
+                    granularity=granularity,
+                    period_start=start,
+                    **delta,
+                )
+                for (test_case, granularity, start), delta in deltas.items()
+            ],
+            batch_size=REBUILD_CHUNK_SIZE,
+        )
+
+    logger.info(f"Rollups rebuilt: {len(deltas)} rollup rows")
+    return len(deltas)
@@ -0,0 +1,187 @@
+import asyncio
+import collections
+import itertools
+import json
+import os
+import socket
+import threading
+import time
+
+from automation.logging.logger import get_logger
+
+logger = get_logger("StepEvents")
+
+# Events buffered per subscriber; older ones are dropped once it is full.
+SUBSCRIBER_BUFFER = int(os.environ.get("AUTOMATION_SSE_BUFFER", 256))
+# host:port of the UDP relay the ASGI server listens on; workflow processes
+# (run_automation, run_worker, the daemon) send their events there. Opt-in
+# (empty = off): any local process could send to it, so keep it on loopback.
+RELAY_ADDRESS = os.environ.get("AUTOMATION_EVENT_RELAY", "")
+# Larger events are trimmed (error text) to fit one datagram.
+MAX_DATAGRAM = 60000
+
+
+class Subscriber:
+    """
+    One listener's bounded queue, filled from workflow threads and drained
+    on the listener's event loop.
+    """
+
+    def __init__(self, run_id, loop, maxlen):
+        self.run_id = run_id
+        self.dropped = 0
+        self._loop = loop
+        self._events = collections.deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._wake = asyncio.Event()
+        self._notified = False
+
+    def push(self, event):
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            if self._notified:
+                return
+            self._notified = True
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # The listener's loop is gone; it will be unsubscribed.
+            pass
+
+    def drain(self):
+        """Buffered events and the number dropped since the last drain."""
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+            dropped, self.dropped = self.dropped, 0
+            self._notified = False
+            self._wake.clear()
+        return events, dropped
+
+    async def wait(self, timeout):
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _parse_address(address):
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class _RelayProtocol(asyncio.DatagramProtocol):
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+
+    def datagram_received(self, data, addr):
+        try:
+            event = json.loads(data)
+        except ValueError:
+            return
+        if isinstance(event, dict) and "event" in event:
+            self.broadcaster.deliver(event)
+
+
+class StepEventBroadcaster:
+    """
+    Fan-out of step events to async listeners (the SSE view).
+
+    publish() is called from workflow threads and never blocks on a
+    listener: each subscriber has a bounded buffer that drops its oldest
+    events when the listener falls behind. Events reach listeners in the
+    same process directly; with RELAY_ADDRESS set, other processes get
+    them through the UDP relay that start_relay() opens in the ASGI server.
+    A datagram that cannot be sent (relay down) is dropped rather than
+    retried.
+    """
+
+    def __init__(self, buffer_size=SUBSCRIBER_BUFFER, relay_address=RELAY_ADDRESS):
+        self.buffer_size = buffer_size
+        self.relay_address = _parse_address(relay_address) if relay_address else None
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._socket = None
+        self._relay_transport = None
+
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+
+    async def start_relay(self):
+        """Receive other processes' events; idempotent, safe to call per request."""
+        if self.relay_address is None or self._relay_transport is not None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            self._relay_transport, _ = await loop.create_datagram_endpoint(
+                lambda: _RelayProtocol(self), local_addr=self.relay_address
+            )
+        except OSError as e:
+            logger.warning(f"Step event relay unavailable on {self.relay_address}: {e}")
+            return
+        logger.info(f"Step event relay listening on {self.relay_address}")
+
+    def subscribe(self, run_id=None):
+        """Listen to one run, or to every run with run_id=None."""
+        subscriber = Subscriber(run_id, asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            self._subscribers.setdefault(run_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            listeners = self._subscribers.get(subscriber.run_id)
+            if listeners is not None:
+                listeners.discard(subscriber)
+                if not listeners:
+                    del self._subscribers[subscriber.run_id]
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(self, run_id, event_type, **data):
+        event = {"event": event_type, "run_id": run_id, "ts": time.time(), **data}
+        self.deliver(event)
+        # The relay process already delivered it above.
+        if self.relay_address is not None and self._relay_transport is None:
+            self._forward(event)
+
+    def deliver(self, event):
+        """Hand one event to this process's subscribers."""
+        if not self._subscribers:
+            return
+        with self._lock:
+            listeners = [
+                *self._subscribers.get(event["run_id"], ()),
+                *self._subscribers.get(None, ()),
+            ]
+        if not listeners:
+            return
+        event = {"id": next(self._ids), **event}
+        for subscriber in listeners:
+            subscriber.push(event)
+
+    def _forward(self, event):
+        payload = json.dumps(event, ensure_ascii=False, default=str).encode("utf-8")
+        if len(payload) > MAX_DATAGRAM and "error" in event:
+            event = {**event, "error": event["error"][:2000]}
+            payload = json.dumps(event, ensure_ascii=False, default=str).encode("utf-8")
+        if len(payload) > MAX_DATAGRAM:
+            return
+        try:
+            if self._socket is None:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sock.setblocking(False)
+                self._socket = sock
+            self._socket.sendto(payload, self.relay_address)
+        except OSError:
+            # Nobody listening, or the socket buffer is full: drop it.
+            pass
+
+
+broadcaster = StepEventBroadcaster()
@@ -1,17 +1,179 @@
-from automation.logging.logger import get_logger
-from automation.playwright.core.browser_manager import BrowserManager
-from automation.playwright.workflow.user_workflow import UserWorkflow
+import threading
+
+from django.db import connections
+
+from automation.logging.logger import get_logger, log_context
+from automation.service.rollups import record_run
+from automation.service.step_events import broadcaster
+
+# The browser, page objects and workflows are imported on first use, so
+# importing the runner (commands, job queue) stays cheap.
 
 logger = get_logger("WorkFlowRunner")
 
 
 class WorkFlowRunner:
-    def run_user_workflow(self):
+    def run_user_workflow(
+        self,
+        checkpoint_key=None,
+        context_template=None,
+        skip_clear=False,
+        params=None,
+        launch_profile=None,
+        http_cache=None,
+    ):
+        from automation.playwright.core.browser_manager import BrowserManager
+
         logger.info("Starting user workflow...")
 
-        with BrowserManager() as page:
-            workflow = UserWorkflow(page)
+        manager = BrowserManager(
+            context_template=context_template,
+            launch_profile=launch_profile,
+            http_cache=http_cache,
+        )
+        with manager as page:
+            result = self.run_on_page(
+                page,
+                params=params,
+                checkpoint_key=checkpoint_key,
+                clear_browser_data=not (skip_clear and manager.template_is_clean),
+            )
+            result["http_cache"] = manager.take_cache_stats()
+            return result
+
+    def run_on_page(
+        self,
+        page,
+        params=None,
+        stop_event=None,
+        checkpoint_key=None,
+        clear_browser_data=True,
+    ):
+        """
+        Run UserWorkflow on an already open page and flush its results.
+
+        checkpoint_key resumes from (and saves to) that key's checkpoints;
+        without it the run's own run_id is used and nothing is resumed.
+        clear_browser_data=False skips the post-landing storage wipe (for
+        contexts created from a clean ContextTemplate).
+        """
+        from automation.playwright.workflow.user_workflow import UserWorkflow
+
+        workflow = UserWorkflow(
+            page,
+            params=params,
+            stop_event=stop_event,
+            checkpoint_key=checkpoint_key,
+            clear_browser_data=clear_browser_data,
+        )
+        return self._run_workflow(workflow)
+
+    def _run_workflow(self, workflow):
+        with log_context(run_id=workflow.run_id):
             result = workflow.run()
+        result["run_id"] = workflow.run_id
+        result["checkpoint_key"] = workflow.checkpoint_key
+        broadcaster.publish(workflow.run_id, "end", status=result["status"])
 
-            logger.info("Saving result to DB")
-            return result
+        logger.info("Saving result to DB")
+        try:
+            record_run(workflow.step_outcomes, status=result["status"])
+        except Exception as e:
+            logger.error(f"Failed to update rollups: {e}")
+        return result
+
+    def run_scenario_sweep(
+        self, countries, dates=None, guests=None, **browser_kwargs
+    ):
+        """Run a countries × dates × guests sweep with shared prefixes."""
+        from automation.playwright.core.browser_manager import BrowserManager
+        from automation.playwright.workflow.scenario_tree import (
+            ScenarioSweep,
+            build_scenario_tree,
+        )
+
+        tree = build_scenario_tree(countries, dates, guests)
+        logger.info(
+            f"Starting scenario sweep: {len(tree.children)} branches, "
+            f"{len(tree.leaves())} scenarios"
+        )
+
+        with BrowserManager(**browser_kwargs) as page:
+            sweep = ScenarioSweep(page, tree)
+            results = sweep.run()
+
+        for workflow in sweep.workflows:
+            try:
+                record_run(workflow.step_outcomes)
+            except Exception as e:
+                logger.error(f"Failed to update rollups: {e}")
+        return results
+
+    def run_engine_matrix(
+        self,
+        engines,
+        params=None,
+        headless=False,
+        context_template=None,
+        skip_clear=False,
+        launch_profile=None,
+        http_cache=None,
+    ):
+        """
+        Run UserWorkflow on several browser engines at once.
+
+        Every engine gets its own thread, Playwright driver and browser (the
+        sync API is bound to the thread that started it), so the wall time
+        is that of the slowest engine. Steps are recorded under an
+        "[engine] " prefix. Returns {engine: result} where each result also
+        carries "steps": [(step name, passed, duration_ms), ...].
+        """
+        from automation.playwright.core.browser_manager import BrowserManager
+        from automation.playwright.workflow.user_workflow import UserWorkflow
+
+        results = {}
+
+        def run(engine):
+            manager = BrowserManager(
+                headless=headless,
+                context_template=context_template,
+                engine=engine,
+                launch_profile=launch_profile,
+                http_cache=http_cache,
+            )
+            workflow = None
+            try:
+                with manager as page:
+                    workflow = UserWorkflow(
+                        page,
+                        params=params,
+                        clear_browser_data=not (
+                            skip_clear and manager.template_is_clean
+                        ),
+                        step_prefix=f"[{engine}] ",
+                    )
+                    result = self._run_workflow(workflow)
+                    result["http_cache"] = manager.take_cache_stats()
+            except Exception as e:
+                logger.error(f"{engine} run crashed: {e}", exc_info=True)
+                result = {"status": "FAIL", "error": str(e)}
+            finally:
+                connections.close_all()
+
+            prefix_len = len(f"[{engine}] ")
+            result["steps"] = [
+                (o["test_case"][prefix_len:], o["passed"], o["duration_ms"])
+                for o in (workflow.step_outcomes if workflow else [])
+            ]
+            results[engine] = result
+
+        logger.info(f"Starting engine matrix: {', '.join(engines)}")
+        threads = [
+            threading.Thread(target=run, args=(engine,), name=f"engine-{engine}")
+            for engine in engines
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {engine: results[engine] for engine in engines}
@@ -1,3 +1,479 @@
-from django.test import TestCase
+import base64
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+
+from automation.models import (
+    Result,
+    StepRollup,
+    WorkflowCheckpoint,
+    WorkflowJob,
+    WorkflowRun,
+)
+from automation.service import jobs, rollups
+from automation.service.export import ExportError, _parse_moment, filter_results
+from automation.service.results_api import ApiError, decode_cursor, encode_cursor
+
+# Cumulative import time allowed for `manage.py check` (milliseconds).
+IMPORT_BUDGET_MS = int(os.environ.get("AUTOMATION_IMPORT_BUDGET_MS", 1500))
+# Must only be imported when a browser is actually started.
+HEAVY_MODULES = ("playwright", "greenlet", "pyee", "numpy", "PIL")
+
+
+def _importtime(*args):
+    """Run manage.py under -X importtime; returns {module: cumulative_us}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "manage.py", *args],
+        cwd=settings.BASE_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        raise AssertionError(f"manage.py {' '.join(args)} failed:\n{proc.stderr}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules[name[1:].rstrip()] = int(cumulative)
+    return modules
+
+
+class ImportTimeBudgetTest(SimpleTestCase):
+    def test_check_does_not_import_browser_stack(self):
+        modules = _importtime("check")
+        loaded = {name.strip().split(".")[0] for name in modules}
+        self.assertFalse(
+            loaded & set(HEAVY_MODULES),
+            f"manage.py check imported {sorted(loaded & set(HEAVY_MODULES))}",
+        )
+
+    def test_check_import_time_budget(self):
+        modules = _importtime("check")
+        # Top-level entries (no indentation) add up to the total import time.
+        total_ms = sum(
+            us for name, us in modules.items() if not name.startswith(" ")
+        ) / 1000
+        self.assertLess(
+            total_ms,
+            IMPORT_BUDGET_MS,
+            f"manage.py check spent {total_ms:.0f} ms importing "
+            f"(budget {IMPORT_BUDGET_MS} ms)",
+        )
+
+
+class ResultAdminSearchTest(TestCase):
+    def test_plain_terms_match_inside_step_names(self):
+        from django.contrib.admin.sites import site
+
+        Result.objects.create(test_case="[Japan 2A] Step 5: Type country", comment="")
+        Result.objects.create(test_case="[Kenya 2A] Step 5: Type country", comment="")
+        Result.objects.create(test_case="Step 23: Extract", comment="5 in Japan")
+        model_admin = site._registry[Result]
+        request = RequestFactory().get("/admin/automation/result/")
+
+        def search(term):
+            qs, _ = model_admin.get_search_results(
+                request, Result.objects.all(), term
+            )
+            return sorted(qs.values_list("test_case", flat=True))
+
+        self.assertEqual(search("japan"), ["[Japan 2A] Step 5: Type country"])
+        self.assertEqual(search("comment: in japan"), ["Step 23: Extract"])
+
+
+class SaveResultTest(TransactionTestCase):
+    def _workflow(self):
+        from automation.playwright.core.base_workflow import BaseWorkflow
+
+        page = mock.Mock(url="https://www.airbnb.com/s/Japan/homes")
+        return BaseWorkflow(
+            page, collect_metrics=False, trace_buffer=0, visual_baseline=False
+        )
+
+    def test_returns_the_result(self):
+        result = self._workflow()._save_result("Step 1", passed=True)
+        self.assertIsInstance(result, Result)
+        self.assertEqual(result.url, "https://www.airbnb.com/s/Japan/homes")
+
+    async def test_inside_an_event_loop_the_write_is_awaitable(self):
+        workflow = self._workflow()
+        result = await workflow._save_result("Step 1", passed=True, comment="queued")
+        self.assertEqual((result.test_case, result.comment), ("Step 1", "queued"))
+
+        result = await workflow._asave_result("Step 1", passed=False)
+        self.assertFalse(result.passed)
+        self.assertEqual(await Result.objects.acount(), 1)
+
+
+class JobQueueTest(TestCase):
+    def test_validate_params(self):
+        valid = {"country": "Japan", "checkin": "2026-12-01", "checkout": "2026-12-05"}
+        self.assertEqual(jobs.validate_params(valid), valid)
+        invalid = [
+            {"city": "Tokyo"},
+            {"checkin": "2026-12-01"},
+            {"checkin": "2026-12-05", "checkout": "2026-12-01"},
+            {"checkin": "2026-02-30", "checkout": "2026-03-02"},
+            {"adults": -1},
+            {"adults": "2"},
+            {"listing_source": "api"},
+        ]
+        for params in invalid:
+            with self.subTest(params=params), self.assertRaises(jobs.JobError):
+                jobs.validate_params(params)
+
+    def test_claim_job_takes_oldest_pending_once(self):
+        first = jobs.enqueue_job({"country": "Japan"})
+        second = jobs.enqueue_job({"country": "Kenya"})
+
+        claimed = jobs.claim_job("worker-a")
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual(claimed.status, WorkflowJob.RUNNING)
+        self.assertEqual(claimed.worker_id, "worker-a")
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNotNone(claimed.lease_expires_at)
+
+        self.assertEqual(jobs.claim_job("worker-b").pk, second.pk)
+        self.assertIsNone(jobs.claim_job("worker-c"))
+
+    def test_requeue_expired_jobs(self):
+        retry = jobs.enqueue_job(max_attempts=3)
+        final = jobs.enqueue_job(max_attempts=1)
+        live = jobs.enqueue_job()
+        for _ in range(3):
+            jobs.claim_job("worker-a")
+        past = timezone.now() - timedelta(seconds=1)
+        WorkflowJob.objects.filter(pk__in=[retry.pk, final.pk]).update(
+            lease_expires_at=past
+        )
+
+        self.assertEqual(jobs.requeue_expired_jobs(), 1)
+        retry.refresh_from_db()
+        final.refresh_from_db()
+        live.refresh_from_db()
+        self.assertEqual(retry.status, WorkflowJob.PENDING)
+        self.assertEqual(retry.worker_id, "")
+        self.assertEqual(final.status, WorkflowJob.FAILED)
+        self.assertEqual(live.status, WorkflowJob.RUNNING)
+
+    def test_failed_run_is_retried_until_attempts_run_out(self):
+        job = jobs.enqueue_job(max_attempts=2)
+        browser = mock.Mock(template_is_clean=False)
+        runner = mock.Mock()
+        runner.run_on_page.return_value = {"status": "FAIL", "error": "boom"}
+        worker = jobs.JobWorker()
+
+        worker._run_job(browser, runner, jobs.claim_job(worker.worker_id))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (WorkflowJob.PENDING, 1))
+        checkpoint = WorkflowCheckpoint.objects.create(
+            key=f"job-{job.pk}", name="search", url=""
+        )
+
+        worker._run_job(browser, runner, jobs.claim_job(worker.worker_id))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (WorkflowJob.FAILED, 2))
+        self.assertEqual(job.error, "boom")
+        self.assertFalse(WorkflowCheckpoint.objects.filter(pk=checkpoint.pk).exists())
+
+
+class RollupTest(TestCase):
+    def test_bucket_index(self):
+        self.assertEqual(rollups.bucket_index(0), 0)
+        self.assertEqual(rollups.bucket_index(100), 0)
+        self.assertEqual(rollups.bucket_index(100.5), 1)
+        self.assertEqual(rollups.bucket_index(30000), 7)
+        self.assertEqual(
+            rollups.bucket_index(30001), len(rollups.DURATION_BUCKETS_MS)
+        )
+
+    def test_period_start(self):
+        moment = timezone.make_aware(datetime(2026, 10, 19, 14, 35, 12))
+        hour = rollups.period_start(moment, StepRollup.HOUR)
+        day = rollups.period_start(moment, StepRollup.DAY)
+        self.assertEqual(hour, timezone.make_aware(datetime(2026, 10, 19, 14)))
+        self.assertEqual(day, timezone.make_aware(datetime(2026, 10, 19)))
+
+    def _make_outcome(self, run_id, test_case, passed, duration_ms, minute):
+        return {
+            "run_id": run_id,
+            "test_case": test_case,
+            "passed": passed,
+            "duration_ms": duration_ms,
+            "finished_at": timezone.make_aware(datetime(2026, 10, 19, 14, minute)),
+        }
+
+    def test_record_run_accumulates(self):
+        rollups.record_run(
+            [
+                self._make_outcome("r1", "Open", True, 50, 1),
+                self._make_outcome("r1", "Search", False, 700, 2),
+            ]
+        )
+        rollups.record_run([self._make_outcome("r2", "Open", True, 200, 10)])
+
+        rollup = StepRollup.objects.get(test_case="Open", granularity=StepRollup.HOUR)
+        self.assertEqual(rollup.total, 2)
+        self.assertEqual(rollup.failures, 0)
+        self.assertEqual(rollup.duration_sum_ms, 250)
+        self.assertEqual(rollup.duration_histogram[:2], [1, 1])
+        self.assertEqual(sum(rollup.duration_histogram), 2)
+        self.assertEqual(StepRollup.objects.filter(test_case="Open").count(), 2)
+
+        run = WorkflowRun.objects.get(run_id="r1")
+        self.assertEqual(run.status, WorkflowRun.FAIL)
+        self.assertEqual((run.steps, run.failures, run.duration_ms), (2, 1, 750))
+        self.assertEqual(
+            WorkflowRun.objects.get(run_id="r2").status, WorkflowRun.PASS
+        )
+
+
+class ExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Result.objects.create(test_case="Step 1: Open", passed=True)
+        Result.objects.create(test_case="Step 2: Search", passed=False)
+
+    def test_filter_results(self):
+        self.assertEqual(filter_results(status="pass").count(), 1)
+        self.assertEqual(filter_results(step="search").get().passed, False)
+        today = timezone.localdate().isoformat()
+        self.assertEqual(filter_results(since=today, until=today).count(), 2)
+        self.assertEqual(filter_results(until="2000-01-01").count(), 0)
+        with self.assertRaises(ExportError):
+            filter_results(status="maybe")
+
+    def test_parse_moment(self):
+        end = _parse_moment("2026-10-19", end_of_day=True)
+        self.assertEqual((end.hour, end.minute), (23, 59))
+        self.assertTrue(timezone.is_aware(end))
+        for value in ("yesterday", "2026-02-30", "2026-10-19T25:00"):
+            with self.subTest(value=value), self.assertRaises(ExportError):
+                _parse_moment(value)
+
+    def test_impossible_date_is_a_bad_request(self):
+        staff = get_user_model().objects.create_user(
+            "staff", password="x", is_staff=True
+        )
+        self.client.force_login(staff)
+        response = self.client.get(
+            "/automation/export/results.csv", {"since": "2026-02-30"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class ResultsApiTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user(
+            "staff", password="x", is_staff=True
+        )
+        for name in ("Step 1", "Step 2", "Step 3"):
+            Result.objects.create(test_case=name, passed=name != "Step 2")
+
+    def test_cursor_round_trip(self):
+        moment = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(moment, 42)), (moment, 42))
+        bad_date = base64.urlsafe_b64encode(b'["x", 1]').decode()
+        for cursor in ("", "not-a-cursor", bad_date):
+            with self.subTest(cursor=cursor), self.assertRaises(ApiError):
+                decode_cursor(cursor)
+
+    def test_pages_follow_the_cursor(self):
+        self.client.force_login(self.staff)
+        seen = []
+        params = {"limit": 2}
+        while True:
+            page = self.client.get("/automation/api/steps/", params).json()
+            seen += [row["test_case"] for row in page["results"]]
+            if not page["next_cursor"]:
+                break
+            params["cursor"] = page["next_cursor"]
+        self.assertEqual(sorted(seen), ["Step 1", "Step 2", "Step 3"])
+
+        failed = self.client.get("/automation/api/steps/", {"status": "fail"}).json()
+        self.assertEqual([r["test_case"] for r in failed["results"]], ["Step 2"])
+
+    def test_unchanged_page_answers_304(self):
+        self.client.force_login(self.staff)
+        response = self.client.get("/automation/api/steps/")
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        again = self.client.get("/automation/api/steps/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again["ETag"], etag)
+
+        Result.objects.create(test_case="Step 4", passed=True)
+        changed = self.client.get("/automation/api/steps/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+
+    def test_requires_staff_or_token(self):
+        self.assertEqual(self.client.get("/automation/api/runs/").status_code, 403)
+        with mock.patch("automation.views.API_TOKEN", "secret"):
+            response = self.client.get(
+                "/automation/api/runs/", HTTP_AUTHORIZATION="Bearer secret"
+            )
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get(
+                "/automation/api/runs/", HTTP_AUTHORIZATION="Bearer wrong"
+            )
+            self.assertEqual(response.status_code, 403)
+
+
+class ScenarioSweepTest(SimpleTestCase):
+    def test_swaps_dates_and_guests_only(self):
+        from urllib.parse import parse_qs, urlsplit
+
+        from automation.playwright.workflow.scenario_tree import rewrite_search_url
+
+        url = (
+            "https://www.airbnb.com/s/Japan/homes?query=Japan"
+            "&checkin=2026-12-01&checkout=2026-12-05&adults=2"
+        )
+        rewritten = rewrite_search_url(
+            url,
+            {"country": "Kenya", "checkin": "2027-01-10", "adults": 3, "children": 1},
+        )
+        parts = urlsplit(rewritten)
+        query = parse_qs(parts.query)
+        self.assertEqual(parts.path, "/s/Japan/homes")
+        self.assertEqual(query["query"], ["Japan"])
+        self.assertEqual(query["checkin"], ["2027-01-10"])
+        self.assertEqual(query["checkout"], ["2026-12-05"])
+        self.assertEqual(query["adults"], ["3"])
+        self.assertEqual(query["children"], ["1"])
+
+    def test_branch_closes_its_tabs_and_ends_its_stream(self):
+        from automation.playwright.workflow import scenario_tree
+
+        shared, opened = mock.Mock(), mock.Mock()
+        shared.context.pages = [shared, opened]
+        tree = scenario_tree.ScenarioNode("prefix")
+        sweep = scenario_tree.ScenarioSweep(shared, tree)
+        workflow = mock.Mock(run_id="r1")
+        branch = mock.Mock(side_effect=Exception("boom"))
+        with mock.patch.object(scenario_tree, "broadcaster") as events:
+            sweep._run_branch(branch, scenario_tree.ScenarioNode("Japan"), workflow)
+
+        opened.close.assert_called_once_with()
+        shared.close.assert_not_called()
+        events.publish.assert_called_once_with("r1", "end", status="FAIL")
+        self.assertEqual(sweep.results[0]["status"], "FAIL")
+
+
+class ParseListingsTest(SimpleTestCase):
+    def test_graphql_and_legacy_results(self):
+        from automation.playwright.utils.listing_capture import parse_listings
+
+        global_id = base64.b64encode(b"DemandStayListing:123").decode()
+        payload = {
+            "data": {
+                "presentation": {
+                    "searchResults": [
+                        {
+                            "demandStayListing": {"id": global_id},
+                            "title": " Cabin in Nikko ",
+                            "structuredDisplayPrice": {
+                                "primaryLine": {
+                                    "discountedPrice": "$90",
+                                    "price": "$120",
+                                }
+                            },
+                            "contextualPictures": [
+                                {"picture": "a.jpg"},
+                                {"picture": "a.jpg"},
+                            ],
+                        },
+                        {
+                            "listing": {
+                                "id": 456,
+                                "name": "Loft",
+                                "pictureUrls": ["b.jpg"],
+                            },
+                            "pricingQuote": {"rate": {"amountFormatted": "€80"}},
+                        },
+                        {"listing": {"id": 789}},
+                    ]
+                }
+            }
+        }
+        self.assertEqual(
+            parse_listings(payload),
+            [
+                {
+                    "id": "123",
+                    "title": "Cabin in Nikko",
+                    "price": "$90",
+                    "images": ["a.jpg"],
+                },
+                {"id": "456", "title": "Loft", "price": "€80", "images": ["b.jpg"]},
+            ],
+        )
+
+
+def _has_imaging():
+    try:
+        import numpy  # noqa: F401
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@unittest.skipUnless(_has_imaging(), "visual baselines need numpy and Pillow")
+class VisualBaselineTest(SimpleTestCase):
+    def setUp(self):
+        from PIL import Image
+
+        from automation.playwright.utils import visual_diff
+
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        for name in ("BASELINE_DIR", "DIFF_DIR"):
+            patcher = mock.patch.object(
+                visual_diff, name, os.path.join(self.tmp, name.lower())
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.baselines = visual_diff.VisualBaseline()
+        self.baseline_dir = visual_diff.BASELINE_DIR
+        self.page = os.path.join(self.tmp, "page.png")
+        Image.new("RGB", (64, 48), "white").save(self.page)
+
+    def test_only_passing_screenshots_become_baselines(self):
+        self.assertIsNone(
+            self.baselines.compare("step", self.page, create_baseline=False)
+        )
+        self.assertFalse(os.path.exists(self.baseline_dir))
+        self.assertIsNone(self.baselines.compare("step", self.page))
+        self.assertTrue(os.path.exists(os.path.join(self.baseline_dir, "step.png")))
+
+    def test_identical_and_changed_screenshots(self):
+        from PIL import Image, ImageDraw
+
+        self.baselines.compare("step", self.page)
+        same = self.baselines.compare("step", self.page)
+        self.assertEqual(same, {"score": 0.0, "heatmap": "", "skipped": True})
+
+        changed_path = os.path.join(self.tmp, "changed.png")
+        changed = Image.new("RGB", (64, 48), "white")
+        ImageDraw.Draw(changed).rectangle((0, 0, 31, 47), fill="black")
+        changed.save(changed_path)
+        result = self.baselines.compare("step", changed_path, create_baseline=False)
+        self.assertFalse(result["skipped"])
+        self.assertAlmostEqual(result["score"], 0.5)
+        self.assertTrue(os.path.exists(result["heatmap"]))
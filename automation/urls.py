@@ -0,0 +1,13 @@
+from django.urls import path
+
+from automation import views
+
+app_name = "automation"
+
+urlpatterns = [
+    path("rollups/", views.step_rollups, name="step-rollups"),
+    path("export/results.<str:fmt>", views.export_results, name="export-results"),
+    path("api/<str:resource>/", views.results_api, name="results-api"),
+    path("events/", views.step_events, name="step-events"),
+    path("runs/<str:run_id>/events/", views.step_events, name="run-step-events"),
+]
@@ -1,3 +1,293 @@
-from django.shortcuts import render
+import functools
+import hmac
+import json
+import os
+from datetime import timedelta
 
-# Create your views here.
+from asgiref.sync import iscoroutinefunction
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_GET
+from django.views.static import serve
+
+from automation.models import StepRollup
+from automation.service.export import (
+    ExportError,
+    aiter_export,
+    filter_results,
+    iter_export,
+)
+from automation.service.results_api import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    RESOURCES,
+    ApiError,
+    build_filters,
+    fetch_page,
+    page_etag,
+    render_page,
+    select_fields,
+)
+from automation.service.rollups import DURATION_BUCKETS_MS
+from automation.service.step_events import broadcaster
+
+MAX_ROLLUP_DAYS = 366
+# The only media served over HTTP: step images for the admin. Everything
+# else under MEDIA_ROOT (context templates, traces, caches) stays on disk.
+MEDIA_IMAGE_DIRS = (
+    "automation/screenshots/",
+    "automation/thumbnails/",
+    "automation/diffs/",
+    "automation/baselines/",
+)
+MEDIA_IMAGE_TYPES = (".png", ".jpg", ".jpeg", ".webp")
+# Bearer token for dashboards without an admin session (empty = staff only).
+API_TOKEN = os.environ.get("AUTOMATION_API_TOKEN", "")
+# Seconds between SSE keep-alive comments on an idle stream.
+SSE_HEARTBEAT = 15
+
+
+def _has_token(request):
+    if not API_TOKEN:
+        return False
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(
+        token.strip().encode(), API_TOKEN.encode()
+    )
+
+
+def _forbidden():
+    return JsonResponse(
+        {"error": "staff login or 'Authorization: Bearer <token>' required"},
+        status=403,
+    )
+
+
+def staff_or_token_required(view):
+    """
+    Like staff_member_required, but for JSON clients: answers 403 instead of
+    redirecting to the login page, and also accepts AUTOMATION_API_TOKEN.
+    """
+    if iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if not _has_token(request):
+                user = await request.auser()
+                if not (user.is_active and user.is_staff):
+                    return _forbidden()
+            return await view(request, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _has_token(request) and not (
+            request.user.is_active and request.user.is_staff
+        ):
+            return _forbidden()
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@staff_or_token_required
+@require_GET
+def step_rollups(request):
+    """
+    Pass rate and latency per step, read only from the rollup tables.
+
+    Query params: granularity=hour|day (default day), days=N (default 30),
+    step=<exact test case name> (optional).
+    """
+    granularity = request.GET.get("granularity", StepRollup.DAY)
+    if granularity not in (StepRollup.HOUR, StepRollup.DAY):
+        return JsonResponse(
+            {"error": "granularity must be 'hour' or 'day'"}, status=400
+        )
+
+    try:
+        days = min(int(request.GET.get("days", 30)), MAX_ROLLUP_DAYS)
+    except ValueError:
+        return JsonResponse({"error": "days must be an integer"}, status=400)
+
+    rollups = StepRollup.objects.filter(
+        granularity=granularity,
+        period_start__gte=timezone.now() - timedelta(days=days),
+    ).order_by("test_case", "period_start")
+    if request.GET.get("step"):
+        rollups = rollups.filter(test_case=request.GET["step"])
+
+    rows = [
+        {
+            "test_case": r.test_case,
+            "period_start": r.period_start.isoformat(),
+            "total": r.total,
+            "failures": r.failures,
+            "pass_rate": r.pass_rate,
+            "mean_duration_ms": r.mean_duration_ms,
+            "duration_histogram": r.duration_histogram,
+        }
+        for r in rollups
+    ]
+    return JsonResponse(
+        {
+            "granularity": granularity,
+            "days": days,
+            "duration_buckets_ms": list(DURATION_BUCKETS_MS),
+            "rows": rows,
+        }
+    )
+
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+@staff_member_required
+@require_GET
+def export_results(request, fmt):
+    """
+    Stream Result rows as CSV or NDJSON.
+
+    Query params: since, until (ISO date/datetime), status=pass|fail,
+    step=<substring of the test case name>. Rows are read from a server-side
+    iterator and written as they arrive, so memory does not grow with the
+    size of the export.
+    """
+    if fmt not in EXPORT_CONTENT_TYPES:
+        return JsonResponse(
+            {"error": "format must be 'csv' or 'ndjson'"}, status=400
+        )
+
+    try:
+        qs = filter_results(
+            since=request.GET.get("since"),
+            until=request.GET.get("until"),
+            status=request.GET.get("status"),
+            step=request.GET.get("step"),
+        )
+    except ExportError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    # Under ASGI a sync iterator would be buffered whole; stream async there.
+    rows = aiter_export if isinstance(request, ASGIRequest) else iter_export
+    response = StreamingHttpResponse(
+        rows(qs, fmt), content_type=EXPORT_CONTENT_TYPES[fmt]
+    )
+    response["Content-Disposition"] = f'attachment; filename="results.{fmt}"'
+    return response
+
+
+@staff_or_token_required
+@require_GET
+def results_api(request, resource):
+    """
+    Read-only JSON pages of workflow runs ("runs", one WorkflowRun per run),
+    step results ("steps", one Result per test case) or step history
+    ("step-runs", one StepRun per executed step).
+
+    Query params: cursor (next_cursor of the previous page), limit (default
+    100, max 1000), fields=a,b,... (comment / metrics only when listed),
+    status=pass|fail, step=<exact test case name> (steps, step-runs),
+    run_id (step-runs). Pages carry ETag and Last-Modified; unchanged pages
+    answer 304.
+    """
+    if resource not in RESOURCES:
+        return JsonResponse(
+            {"error": f"resource must be one of {sorted(RESOURCES)}"}, status=400
+        )
+
+    try:
+        limit = min(int(request.GET.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer"}, status=400)
+    if limit < 1:
+        return JsonResponse({"error": "limit must be positive"}, status=400)
+
+    try:
+        filters = build_filters(resource, request.GET)
+        fields = select_fields(resource, request.GET.get("fields"))
+        rows, next_cursor, last_modified = fetch_page(
+            resource, fields, cursor=request.GET.get("cursor"), limit=limit, **filters
+        )
+    except ApiError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    body = render_page(rows, next_cursor)
+    etag = quote_etag(page_etag(body))
+    last_modified = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    # Cacheable, but clients must revalidate (cheap 304) before reuse.
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def _sse(event):
+    return (
+        f"id: {event['id']}\nevent: {event['event']}\n"
+        f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+    )
+
+
+async def _stream_step_events(run_id):
+    await broadcaster.start_relay()
+    subscriber = broadcaster.subscribe(run_id)
+    try:
+        yield f"retry: 3000\n: subscribed to {run_id or 'all runs'}\n\n"
+        while True:
+            await subscriber.wait(SSE_HEARTBEAT)
+            events, dropped = subscriber.drain()
+            if dropped:
+                yield f"event: dropped\ndata: {json.dumps({'dropped': dropped})}\n\n"
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            yield "".join(_sse(event) for event in events)
+            if run_id and any(event["event"] == "end" for event in events):
+                return
+    finally:
+        # Also reached when the client disconnects and Django cancels us.
+        broadcaster.unsubscribe(subscriber)
+
+
+@staff_or_token_required
+@require_GET
+async def step_events(request, run_id=None):
+    """
+    Server-Sent Events of step start / pass / fail for one run (or every
+    run), published by BaseWorkflow. Needs the ASGI server; workflows in
+    other processes reach it through the step event relay. A client that falls
+    behind loses its oldest buffered events and gets a "dropped" event
+    with their count; the workflow never waits for it.
+    """
+    response = StreamingHttpResponse(
+        _stream_step_events(run_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def media_image(request, path, document_root=None):
+    """django.views.static.serve restricted to MEDIA_IMAGE_DIRS images."""
+    if not (
+        path.startswith(MEDIA_IMAGE_DIRS) and path.lower().endswith(MEDIA_IMAGE_TYPES)
+    ):
+        raise Http404("Not a step image")
+    return serve(request, path, document_root=document_root)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -73,12 +74,45 @@ WSGI_APPLICATION = "automation_testing_airbnb.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# SQLite is tuned for several concurrent workflow writers: WAL lets
+# readers run alongside the single writer, synchronous=NORMAL is durable in
+# WAL mode, IMMEDIATE transactions take the write lock up front (so a busy
+# writer waits instead of failing on lock upgrade) and the timeout is how
+# long it waits. Set AUTOMATION_DB_ENGINE=postgresql to use PostgreSQL.
+
+DB_CONN_MAX_AGE = int(os.environ.get("AUTOMATION_DB_CONN_MAX_AGE", 600))
+
+if os.environ.get("AUTOMATION_DB_ENGINE") == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("AUTOMATION_DB_NAME", "automation"),
+            "USER": os.environ.get("AUTOMATION_DB_USER", "automation"),
+            "PASSWORD": os.environ.get("AUTOMATION_DB_PASSWORD", ""),
+            "HOST": os.environ.get("AUTOMATION_DB_HOST", "localhost"),
+            "PORT": os.environ.get("AUTOMATION_DB_PORT", "5432"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("AUTOMATION_DB_NAME", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "timeout": int(os.environ.get("AUTOMATION_DB_BUSY_TIMEOUT", 20)),
+                "transaction_mode": "IMMEDIATE",
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA temp_store=MEMORY;"
+                ),
+            },
+        }
     }
-}
 
 
 # Password validation
@@ -116,3 +150,7 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = "static/"
+
+# Screenshots, diff heatmaps and traces written by the automation
+MEDIA_URL = "media/"
+MEDIA_ROOT = BASE_DIR / "media"
@@ -14,9 +14,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
+
+from automation.views import media_image
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-]
+    path('automation/', include('automation.urls')),
+] + static(
+    settings.MEDIA_URL, view=media_image, document_root=settings.MEDIA_ROOT
+)